@@ -0,0 +1,186 @@
+"""
+Shared client factories for the agents.
+
+Agents that run in the same process reuse one Groq client per API key (sync,
+or async on the shared loop) and one MongoDB connection pool instead of each
+opening their own. Async HTTP clients are bound to the event loop they run
+on, so agents that share one run their coroutines on a single background
+loop (see run_coroutine).
+"""
+
+import asyncio
+import atexit
+import functools
+import logging
+import threading
+from typing import Awaitable, Dict, List, Optional, TypeVar
+
+import aiohttp
+from groq import AsyncGroq, Groq
+
+from database.mongodb import MongoDBManager
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+_groq_clients: List[Groq] = []
+_async_groq_clients: List[AsyncGroq] = []
+_mongo_managers: List[MongoDBManager] = []
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[threading.Thread] = None
+_loop_lock = threading.Lock()
+_http_sessions: Dict[str, aiohttp.ClientSession] = {}
+
+
+@functools.lru_cache(maxsize=None)
+def get_groq(api_key: str) -> Groq:
+    """
+    Return the shared synchronous Groq client for an API key.
+
+    Args:
+        api_key: Groq API key
+
+    Returns:
+        Groq client
+    """
+    client = Groq(api_key=api_key)
+    _groq_clients.append(client)
+    return client
+
+
+@functools.lru_cache(maxsize=None)
+def get_async_groq(api_key: str) -> AsyncGroq:
+    """
+    Return the shared async Groq client for an API key.
+
+    Its connection pool binds to the loop it first runs on, so it must
+    only be used from coroutines on the shared loop (see run_coroutine).
+    It is closed at exit, so agents must not close it themselves.
+
+    Args:
+        api_key: Groq API key
+
+    Returns:
+        AsyncGroq client
+    """
+    client = AsyncGroq(api_key=api_key)
+    _async_groq_clients.append(client)
+    return client
+
+
+@functools.lru_cache(maxsize=None)
+def get_mongo(url: str, db: str, coll: str) -> MongoDBManager:
+    """
+    Return a connected MongoDBManager shared by every caller using the same
+    connection settings.
+
+    The shared manager is closed at interpreter exit, so agents must not
+    disconnect it themselves.
+
+    Args:
+        url: MongoDB connection string
+        db: Name of the database
+        coll: Name of the articles collection
+
+    Returns:
+        Connected MongoDBManager
+
+    Raises:
+        ConnectionError: If MongoDB cannot be reached (nothing is cached)
+    """
+    manager = MongoDBManager(
+        connection_url=url,
+        database_name=db,
+        collection_name=coll
+    )
+    if not manager.connect():
+        raise ConnectionError("Failed to connect to MongoDB")
+    _mongo_managers.append(manager)
+    return manager
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the shared event loop, starting its background thread on first use.
+
+    Returns:
+        Event loop running forever in a daemon thread
+    """
+    global _loop, _loop_thread
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            _loop_thread = threading.Thread(target=_loop.run_forever, name="agents-event-loop", daemon=True)
+            _loop_thread.start()
+        return _loop
+
+
+def run_coroutine(coro: Awaitable[T]) -> T:
+    """
+    Run a coroutine on the shared event loop and wait for its result.
+
+    Safe to call from any thread except the loop's own, so agents running
+    in different scheduler threads can share the loop's clients.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        The coroutine's result (its exception is re-raised)
+    """
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop()).result()
+
+
+async def get_http_session(name: str, limit: int = 100, dns_cache_ttl: int = 10) -> aiohttp.ClientSession:
+    """
+    Return the shared aiohttp session with the given name, creating it on first use.
+
+    Must be awaited on the shared event loop. Each name gets its own
+    connection pool; the connector settings of the first caller apply to
+    every later caller of the same name.
+
+    Args:
+        name: Pool name (e.g. one per agent)
+        limit: Maximum simultaneous connections
+        dns_cache_ttl: Seconds DNS lookups stay cached
+
+    Returns:
+        aiohttp ClientSession
+    """
+    session = _http_sessions.get(name)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(limit=limit, use_dns_cache=True, ttl_dns_cache=dns_cache_ttl)
+        session = _http_sessions[name] = aiohttp.ClientSession(connector=connector)
+    return session
+
+
+def _close_event_loop():
+    """Close the shared HTTP sessions and async clients and stop the shared event loop."""
+    if _loop is None or _loop.is_closed():
+        _async_groq_clients.clear()
+        get_async_groq.cache_clear()
+        return
+    while _http_sessions:
+        run_coroutine(_http_sessions.popitem()[1].close())
+    while _async_groq_clients:
+        run_coroutine(_async_groq_clients.pop().close())
+    get_async_groq.cache_clear()
+    _loop.call_soon_threadsafe(_loop.stop)
+    _loop_thread.join()
+    _loop.close()
+
+
+@atexit.register
+def close_all():
+    """Close every shared client and clear the factory caches."""
+    _close_event_loop()
+
+    while _mongo_managers:
+        _mongo_managers.pop().disconnect()
+    get_mongo.cache_clear()
+
+    while _groq_clients:
+        _groq_clients.pop().close()
+    get_groq.cache_clear()
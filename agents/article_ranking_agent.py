@@ -4,19 +4,92 @@ Uses LLM to select the best trending article from fetched articles.
 """
 
 import logging
-import yaml
-from typing import Dict, List, Any, Optional
+import re
+from typing import Dict, FrozenSet, List, Any, Optional, Tuple
 
 from groq import Groq
 
 import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pathlib import Path
 
+# Running as a script (python agents/<name>.py) puts agents/ rather than the
+# project root on sys.path; package imports need no adjustment
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents._clients import get_groq, get_mongo
 from database.mongodb import MongoDBManager
+from utils import fastjson
+from utils.config import load_config
 
 logger = logging.getLogger(__name__)
 
+# Titles whose 5-character shingle sets overlap at least this much (Jaccard)
+# are treated as the same story
+DUPLICATE_TITLE_SIMILARITY = 0.6
+SHINGLE_SIZE = 5
+
+# Raw article fields deduplication and ranking read
+RANKING_FIELDS = {"title": 1, "description": 1, "source": 1}
+
+_NON_WORD_RE = re.compile(r"[^\w\s]+")
+
+
+def _title_shingles(title: str) -> FrozenSet[str]:
+    """Character shingles of a title, ignoring case, punctuation and spacing."""
+    normalized = " ".join(_NON_WORD_RE.sub(" ", title.lower()).split())
+    if len(normalized) <= SHINGLE_SIZE:
+        return frozenset([normalized]) if normalized else frozenset()
+    return frozenset(normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1))
+
+
+def dedupe_by_title(articles: List[Dict]) -> Tuple[List[int], List[int]]:
+    """
+    Cluster near-duplicate articles by title similarity.
+    
+    Articles are grouped when the Jaccard similarity of their title
+    shingles reaches DUPLICATE_TITLE_SIMILARITY (transitively). Each
+    cluster is represented by the article with the longest description.
+    
+    Args:
+        articles: List of article dictionaries
+        
+    Returns:
+        Tuple of (representative indices, duplicate indices), both sorted
+    """
+    shingles = [_title_shingles(article.get("title") or "") for article in articles]
+    parent = list(range(len(articles)))
+    
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    
+    for i in range(len(articles)):
+        if not shingles[i]:
+            continue
+        for j in range(i + 1, len(articles)):
+            if not shingles[j]:
+                continue
+            overlap = len(shingles[i] & shingles[j])
+            if overlap and overlap / len(shingles[i] | shingles[j]) >= DUPLICATE_TITLE_SIMILARITY:
+                parent[find(j)] = find(i)
+    
+    best: Dict[int, int] = {}
+    for i, article in enumerate(articles):
+        root = find(i)
+        current = best.get(root)
+        if current is None or (
+            len(article.get("description") or "") > len(articles[current].get("description") or "")
+        ):
+            best[root] = i
+    
+    representatives = sorted(best.values())
+    keep = set(representatives)
+    duplicates = [i for i in range(len(articles)) if i not in keep]
+    return representatives, duplicates
+
 
 class ArticleRankingAgent:
     """
@@ -44,20 +117,16 @@ class ArticleRankingAgent:
     
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         """Load configuration from YAML file."""
-        with open(config_path, "r") as f:
-            return yaml.safe_load(f)
+        return load_config(config_path)
     
     def _init_database(self) -> MongoDBManager:
         """Initialize MongoDB connection."""
         mongo_config = self.config["MONGODB"]
-        db = MongoDBManager(
-            connection_url=mongo_config["CONNECTION_URL"],
-            database_name=mongo_config["DATABASE_NAME"],
-            collection_name=mongo_config["COLLECTION_NAME"]
+        return get_mongo(
+            mongo_config["CONNECTION_URL"],
+            mongo_config["DATABASE_NAME"],
+            mongo_config["COLLECTION_NAME"]
         )
-        if not db.connect():
-            raise ConnectionError("Failed to connect to MongoDB")
-        return db
     
     def _init_llm(self) -> Groq:
         """Initialize Groq LLM client."""
@@ -65,10 +134,10 @@ class ArticleRankingAgent:
         api_key = llm_config.get("API_KEY")
         if not api_key:
             raise ValueError("LLM API_KEY not found in config")
-        return Groq(api_key=api_key)
+        return get_groq(api_key)
     
-    def _call_llm(self, prompt: str, system_prompt: str = None) -> str:
-        """Make a call to the Groq LLM."""
+    def _call_llm(self, prompt: str, system_prompt: str = None, json_mode: bool = False) -> str:
+        """Make a call to the Groq LLM, optionally in JSON object mode."""
         llm_config = self.config.get("LLM", {})
         model = llm_config.get("MODEL", "llama-3.3-70b-versatile")
         
@@ -77,70 +146,98 @@ class ArticleRankingAgent:
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
         
+        extra_args = {}
+        if json_mode:
+            extra_args["response_format"] = {"type": "json_object"}
+        
         try:
             response = self.llm.chat.completions.create(
                 model=model,
                 messages=messages,
                 temperature=0.3,  # Lower temp for more consistent ranking
-                max_tokens=200
+                max_tokens=200,
+                **extra_args
             )
             return response.choices[0].message.content.strip()
         except Exception as e:
-            logger.error(f"LLM call failed: {e}")
+            logger.error("LLM call failed: %s", e)
             raise
     
-    def rank_articles(self, articles: List[Dict]) -> Optional[int]:
+    def rank_articles(self, articles: List[Dict], top_n: Optional[int] = None) -> Optional[List[int]]:
         """
-        Use LLM to rank articles and return the index of the best one.
+        Use LLM to rank articles and return the indices of the best ones.
+        
+        A single call returns the whole top-N ordering, however large N is.
         
         Args:
             articles: List of article dictionaries
+            top_n: Number of articles to select (default from config)
             
         Returns:
-            Index of the best article (0-based), or None if failed
+            Indices of the selected articles (0-based, best first), or None if failed
         """
         if not articles:
             return None
         
-        if len(articles) == 1:
-            return 0  # Only one article, it's the best by default
+        top_n = min(top_n or self.top_n, len(articles))
+        if len(articles) <= top_n:
+            return list(range(len(articles)))  # Nothing to choose between
         
         # Build the prompt with article summaries
-        articles_text = ""
+        parts = []
         for i, article in enumerate(articles, 1):
-            title = article.get("title", "No title")
-            description = article.get("description", "No description")
-            source = article.get("source", "Unknown")
-            articles_text += f"\n{i}. [{source}] {title}\n   {description}\n"
+            get = article.get
+            parts.append(
+                f"\n{i}. [{get('source', 'Unknown')}] {get('title', 'No title')}\n"
+                f"   {get('description', 'No description')}\n"
+            )
+        articles_text = "".join(parts)
         
-        system_prompt = """You are a news editor selecting the most newsworthy article.
+        system_prompt = f"""You are a news editor selecting the most newsworthy articles.
 Consider: breaking news value, global impact, reader interest, and timeliness.
-Respond with ONLY the number of the best article (e.g., "1" or "2"). Nothing else."""
+Return a JSON object of the form {{"ranking": [...]}} holding the numbers of the
+top {top_n} articles in order, most newsworthy first. Nothing else."""
         
-        prompt = f"""Which of these articles is the MOST trending/newsworthy right now?
+        prompt = f"""Which of these articles are the MOST trending/newsworthy right now?
 {articles_text}
-Reply with just the number (1-{len(articles)}):"""
+Reply with the JSON ranking of the top {top_n} article numbers (1-{len(articles)}):"""
         
+        response = self._call_llm(prompt, system_prompt, json_mode=True)
         try:
-            response = self._call_llm(prompt, system_prompt)
-            # Parse the response - expect a single number
-            choice = int(response.strip().replace(".", "").split()[0])
-            if 1 <= choice <= len(articles):
-                logger.info(f"LLM selected article #{choice} as most trending")
-                return choice - 1  # Convert to 0-based index
+            ranking = fastjson.loads(response)["ranking"]
+            if not isinstance(ranking, list):
+                raise ValueError(f"ranking is not a list: {ranking!r}")
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning("Could not parse LLM response '%s': %s", response, e)
+            return [0]  # Default to first article
+        
+        selected = []
+        for choice in ranking:
+            try:
+                index = int(choice) - 1  # Convert to 0-based index
+            except (ValueError, TypeError):
+                logger.warning("LLM returned invalid choice: %r", choice)
+                continue
+            if 0 <= index < len(articles) and index not in selected:
+                selected.append(index)
             else:
-                logger.warning(f"LLM returned invalid choice: {choice}")
-                return 0  # Default to first article
-        except (ValueError, IndexError) as e:
-            logger.warning(f"Could not parse LLM response '{response}': {e}")
-            return 0  # Default to first article
+                logger.warning("LLM returned invalid choice: %r", choice)
+            if len(selected) == top_n:
+                break
+        
+        if not selected:
+            return [0]  # Default to first article
+        
+        logger.info("LLM selected article(s) %s as most trending", [i + 1 for i in selected])
+        return selected
     
     def run(self) -> Dict[str, Any]:
         """
         Run the article ranking agent.
         
-        Fetches raw articles, ranks them with LLM, and marks non-selected
-        articles as 'filtered' so they won't be processed.
+        Fetches raw articles, drops near-duplicate stories, ranks the rest
+        with LLM, and marks non-selected articles as 'filtered' so they
+        won't be processed.
         
         Returns:
             Summary of ranking operation
@@ -157,10 +254,10 @@ Reply with just the number (1-{len(articles)}):"""
             logger.info("Article ranking is DISABLED - all articles will be processed")
             return result
         
-        logger.info(f"Article ranking is ENABLED - selecting top {self.top_n} article(s)")
+        logger.info("Article ranking is ENABLED - selecting top %d article(s)", self.top_n)
         
         # Get all raw articles
-        raw_articles = self.db.get_raw_articles(limit=100)
+        raw_articles = self.db.get_raw_articles(limit=100, projection=RANKING_FIELDS)
         result["total_raw"] = len(raw_articles)
         
         if not raw_articles:
@@ -168,39 +265,52 @@ Reply with just the number (1-{len(articles)}):"""
             return result
         
         if len(raw_articles) <= self.top_n:
-            logger.info(f"Only {len(raw_articles)} articles, no filtering needed")
+            logger.info("Only %d articles, no filtering needed", len(raw_articles))
             result["selected"] = len(raw_articles)
             return result
         
-        # Rank articles using LLM
-        logger.info(f"Ranking {len(raw_articles)} articles to select top {self.top_n}")
-        best_index = self.rank_articles(raw_articles)
+        # Collapse near-duplicate stories before ranking (no LLM needed)
+        candidates, duplicates = dedupe_by_title(raw_articles)
+        if duplicates:
+            logger.info("Dropped %d near-duplicate article(s), %d unique stories left",
+                        len(duplicates), len(candidates))
         
-        if best_index is None:
-            logger.warning("Ranking failed, keeping all articles")
-            result["selected"] = len(raw_articles)
-            return result
+        if len(candidates) <= self.top_n:
+            logger.info("Only %d unique stories, no ranking needed", len(candidates))
+            selected_indices = candidates
+        else:
+            # Rank articles using LLM
+            logger.info("Ranking %d articles to select top %d", len(candidates), self.top_n)
+            ranked = self.rank_articles([raw_articles[i] for i in candidates])
+            
+            if ranked is None:
+                logger.warning("Ranking failed, keeping all unique articles")
+                selected_indices = candidates
+            else:
+                selected_indices = [candidates[i] for i in ranked]
         
-        # Mark non-selected articles as 'filtered'
-        from bson import ObjectId
+        # Mark non-selected articles as 'filtered' so they won't be processed
+        selected_indices = set(selected_indices)
+        filtered_ids = []
         for i, article in enumerate(raw_articles):
-            article_id = str(article["_id"])
-            if i == best_index:
-                logger.info(f"SELECTED: {article.get('title', 'Unknown')[:60]}...")
+            if i in selected_indices:
+                logger.info("SELECTED: %.60s...", article.get('title', 'Unknown'))
                 result["selected"] += 1
             else:
-                # Mark as filtered so it won't be processed
-                self.db.update_article_status(article_id, "filtered")
-                logger.debug(f"FILTERED: {article.get('title', 'Unknown')[:60]}...")
-                result["filtered"] += 1
+                filtered_ids.append(str(article["_id"]))
+                logger.debug("FILTERED: %.60s...", article.get('title', 'Unknown'))
+        
+        self.db.bulk_update_status(filtered_ids, "filtered")
+        result["filtered"] = len(filtered_ids)
         
-        logger.info(f"Ranking complete: {result['selected']} selected, {result['filtered']} filtered")
+        logger.info("Ranking complete: %d selected, %d filtered", result['selected'], result['filtered'])
         return result
     
     def close(self):
         """Clean up resources."""
-        if self.db:
-            self.db.disconnect()
+        # The Groq client and MongoDB connection are shared process-wide
+        # (see agents._clients) and are closed at exit
+        self.db = None
 
 
 # For running as a standalone script
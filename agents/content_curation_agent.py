@@ -3,22 +3,72 @@ Agent 3: Content Curation & LLM Agent
 Processes raw articles using Groq LLM to generate platform-specific content.
 """
 
+import asyncio
+import hashlib
 import logging
+import re
+from typing import Callable, Dict, Iterable, Iterator, List, Any, Optional, Tuple
 import time
-import yaml
-from typing import Dict, List, Any, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 
-from groq import Groq
+import httpx
+from groq import AsyncGroq, DefaultAsyncHttpxClient
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
 
 import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pathlib import Path
+
+# Running as a script (python agents/<name>.py) puts agents/ rather than the
+# project root on sys.path; package imports need no adjustment
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
+from agents._clients import get_mongo
 from database.mongodb import MongoDBManager
+from utils import fastjson
+from utils.config import load_config
+from utils.rate_limiter import LLMRateLimiter, estimate_tokens
+from utils.tokens import truncate_to_tokens
 
 logger = logging.getLogger(__name__)
 
+# Response budget for the fused single-call prompt, which returns every
+# curated field (summary, rewrite, platform copy) in one JSON object
+SINGLE_CALL_MAX_TOKENS = 4096
+
+# Completion length reserved against the TPM limit before a call; the
+# reservation is corrected with the real usage afterwards
+EXPECTED_COMPLETION_TOKENS = 512
+
+# Token budget for the article excerpts given to the entity and website
+# prompts, which don't need the full text
+EXCERPT_TOKENS = 500
+
+# Line the website prompt asks the model to finish with, so the stream can
+# be cut as soon as the last paragraph is complete
+END_MARKER = "END"
+
+# Labeled sections of the website response, each running up to the next
+# label, the END line or the end of the text
+_SECTION_RE = re.compile(
+    r"^[ \t]*(HEADLINE|SUMMARY|PARAGRAPH_\d+):[ \t]*(.*?)"
+    r"(?=^[ \t]*(?:HEADLINE|SUMMARY|PARAGRAPH_\d+):|^[ \t]*" + END_MARKER + r"[ \t]*$|\Z)",
+    re.M | re.S
+)
+_REWRITE_RE = re.compile(r"SUMMARY:\s*(.*?)\s*REWRITTEN:\s*(.*)", re.S)
+_ENTITY_RE = re.compile(r"^[ \t]*(PEOPLE|ORGANIZATIONS|LOCATIONS):[ \t]*(.*?)[ \t]*$", re.M)
+_ENTITY_KEYS = {'PEOPLE': 'people', 'ORGANIZATIONS': 'organizations', 'LOCATIONS': 'locations'}
+
+
+def _website_content_complete(text: str) -> bool:
+    """Return True once a streamed website response has reached END."""
+    return f"\n{END_MARKER}\n" in text or text.rstrip().endswith(f"\n{END_MARKER}")
+
 
 class ContentCurationAgent:
     """
@@ -31,6 +81,9 @@ class ContentCurationAgent:
     4. Generate hashtags
     5. Create platform-specific content (Website, Telegram, Instagram)
     6. Update database with processed content
+    
+    Articles in a batch are processed concurrently (bounded by
+    MAX_CONCURRENCY) so LLM round-trips overlap instead of adding up.
     """
     
     def __init__(self, config_path: str = "config.yaml"):
@@ -41,54 +94,90 @@ class ContentCurationAgent:
             config_path: Path to YAML configuration file
         """
         self.config = self._load_config(config_path)
+        
+        # Settings
+        curation_config = self.config.get('CONTENT_CURATION', {})
+        self.batch_size = curation_config.get('BATCH_SIZE', 10)
+        self.max_concurrency = curation_config.get('MAX_CONCURRENCY', 4)
+        self.single_call = curation_config.get('SINGLE_CALL', True)
+        
         self.groq_client = self._init_llm()
         self.db = self._init_database()
         
-        # Settings
-        self.batch_size = self.config.get('CONTENT_CURATION', {}).get('BATCH_SIZE', 10)
-        self.delay_between_calls = self.config.get('CONTENT_CURATION', {}).get('DELAY_BETWEEN_CALLS', 2)
+        # The async Groq client keeps a connection pool bound to the loop it
+        # first runs on, so the agent owns one loop for its whole lifetime
+        self._loop = asyncio.new_event_loop()
+        self._llm_semaphore: Optional[asyncio.Semaphore] = None
+        # (article_id, curated_data) pairs awaiting one bulk write per run
+        self._pending_updates: List[Tuple[str, Dict]] = []
+        
+        # Groq free-tier limits for llama-3.3-70b-versatile by default
+        llm_config = self.config.get('LLM', {})
+        self.max_input_tokens = llm_config.get('MAX_INPUT_TOKENS', 1750)
+        self.rate_limiter = LLMRateLimiter(
+            rpm=llm_config.get('RPM', 30),
+            tpm=llm_config.get('TPM', 12000)
+        )
         
     def _load_config(self, config_path: str) -> Dict:
         """Load configuration from YAML file."""
         try:
-            with open(config_path, 'r') as f:
-                return yaml.safe_load(f)
+            return load_config(config_path)
         except Exception as e:
-            logger.error(f"Failed to load config: {e}")
+            logger.error("Failed to load config: %s", e)
             raise
     
-    def _init_llm(self) -> Groq:
-        """Initialize Groq LLM client."""
+    def _init_llm(self) -> AsyncGroq:
+        """Initialize async Groq LLM client."""
         llm_config = self.config.get('LLM', {})
         api_key = llm_config.get('API_KEY')
         
         if not api_key or api_key == "your_groq_api_key_here":
             raise ValueError("Please set your Groq API key in config.yaml")
         
-        client = Groq(api_key=api_key)
+        # One pooled connection per concurrent call, kept alive long enough
+        # to survive rate-limiter waits between calls (httpx's default
+        # keepalive expiry is 5s, which forces fresh TLS handshakes)
+        http_client = DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+                keepalive_expiry=60.0
+            ),
+            http2=_HTTP2
+        )
+        client = AsyncGroq(api_key=api_key, http_client=http_client)
         logger.info("Groq LLM client initialized")
         return client
     
     def _init_database(self) -> MongoDBManager:
         """Initialize MongoDB connection."""
         mongo_config = self.config['MONGODB']
-        db = MongoDBManager(
-            connection_url=mongo_config['CONNECTION_URL'],
-            database_name=mongo_config['DATABASE_NAME'],
-            collection_name=mongo_config['COLLECTION_NAME']
+        return get_mongo(
+            mongo_config['CONNECTION_URL'],
+            mongo_config['DATABASE_NAME'],
+            mongo_config['COLLECTION_NAME']
         )
-        if not db.connect():
-            raise ConnectionError("Failed to connect to MongoDB")
-        return db
     
-    def _call_llm(self, prompt: str, system_prompt: str = None, max_tokens: int = None) -> str:
+    async def _call_llm(self, prompt: str, system_prompt: str = None, max_tokens: int = None,
+                        json_mode: bool = False,
+                        stop_when: Optional[Callable[[str], bool]] = None) -> str:
         """
         Make a call to the Groq LLM.
         
+        Calls are bounded by a semaphore shared across all articles in the
+        batch and paced by a token-bucket limiter that only waits when
+        Groq's request/token per-minute limits would be exceeded. Plain-text
+        responses are streamed; JSON mode does not support streaming on
+        Groq, so those calls wait for the full completion.
+        
         Args:
             prompt: User prompt
             system_prompt: Optional system prompt
             max_tokens: Max tokens for response (default from config)
+            json_mode: Ask the model to return a single JSON object
+            stop_when: Optional check on the text received so far; the
+                stream is closed early once it returns True
             
         Returns:
             LLM response text
@@ -103,23 +192,85 @@ class ContentCurationAgent:
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
         
+        extra_args = {}
+        if json_mode:
+            extra_args['response_format'] = {"type": "json_object"}
+        else:
+            extra_args['stream'] = True
+        
+        estimated_tokens = (estimate_tokens((system_prompt or '') + prompt)
+                            + min(max_tokens, EXPECTED_COMPLETION_TOKENS))
+        
+        # Created on first use so it binds to the running loop
+        if self._llm_semaphore is None:
+            self._llm_semaphore = asyncio.Semaphore(self.max_concurrency)
+        
         try:
-            response = self.groq_client.chat.completions.create(
-                model=model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens
-            )
+            async with self._llm_semaphore:
+                await self.rate_limiter.acquire(estimated_tokens)
+                response = await self.groq_client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    **extra_args
+                )
+                
+                if json_mode:
+                    content = response.choices[0].message.content
+                    usage = response.usage
+                else:
+                    content, usage = await self._read_stream(response, stop_when)
             
-            # Rate limiting delay
-            time.sleep(self.delay_between_calls)
-            
-            return response.choices[0].message.content.strip()
+            self.rate_limiter.settle(estimated_tokens, usage.total_tokens if usage else None)
+            return content.strip()
         except Exception as e:
-            logger.error(f"LLM call failed: {e}")
+            logger.error("LLM call failed: %s", e)
             raise
     
-    def _summarize_and_rewrite(self, article: Dict) -> Dict:
+    @staticmethod
+    async def _read_stream(stream, stop_when: Optional[Callable[[str], bool]] = None) -> Tuple[str, Any]:
+        """
+        Collect a streamed completion into a string.
+        
+        Args:
+            stream: Async iterator of completion chunks
+            stop_when: Optional check run on the text so far at each line
+                break; when it returns True the rest of the stream is dropped
+            
+        Returns:
+            Tuple of (response text received, usage reported on the final
+            chunk or None if the stream was cut short)
+        """
+        parts = []
+        usage = None
+        try:
+            async for chunk in stream:
+                x_groq = getattr(chunk, 'x_groq', None)
+                if x_groq is not None and getattr(x_groq, 'usage', None):
+                    usage = x_groq.usage
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content or ""
+                parts.append(delta)
+                if stop_when and "\n" in delta and stop_when("".join(parts)):
+                    break
+        finally:
+            await stream.close()
+        return "".join(parts), usage
+    
+    @staticmethod
+    def _article_text(article: Dict) -> str:
+        """Return the scraped full text of an article, falling back to the API snippet."""
+        return article.get('full_content') or article.get('content') or ''
+    
+    @staticmethod
+    def _content_hash(text: str) -> str:
+        """SHA-256 of the text with case and whitespace normalized."""
+        normalized = ' '.join(text.lower().split())
+        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+    
+    async def _summarize_and_rewrite(self, article: Dict) -> Dict:
         """
         Summarize and rewrite the article to avoid plagiarism.
         
@@ -127,14 +278,14 @@ class ContentCurationAgent:
             Dict with 'summary' and 'rewritten_content'
         """
         title = article.get('title', '')
-        content = article.get('full_content') or article.get('content', '')
+        content = self._article_text(article)
         
         if not content:
-            logger.warning(f"No content for article: {title}")
+            logger.warning("No content for article: %s", title)
             return {'summary': '', 'rewritten_content': ''}
         
         # Truncate content if too long (to stay within token limits)
-        content = content[:7000]
+        content = truncate_to_tokens(content, self.max_input_tokens)
         
         system_prompt = """You are a professional news editor. Your task is to:
 1. Summarize the article in 2-3 sentences
@@ -158,16 +309,12 @@ SUMMARY:
 REWRITTEN:
 [your rewritten content here]"""
 
-        response = self._call_llm(prompt, system_prompt)
+        response = await self._call_llm(prompt, system_prompt)
         
         # Parse response
-        summary = ""
-        rewritten = ""
-        
-        if "SUMMARY:" in response and "REWRITTEN:" in response:
-            parts = response.split("REWRITTEN:")
-            summary = parts[0].replace("SUMMARY:", "").strip()
-            rewritten = parts[1].strip() if len(parts) > 1 else ""
+        match = _REWRITE_RE.search(response)
+        if match:
+            summary, rewritten = match.group(1), match.group(2).strip()
         else:
             # Fallback - use whole response as summary
             summary = response[:500]
@@ -178,7 +325,7 @@ REWRITTEN:
             'rewritten_content': rewritten
         }
     
-    def _extract_entities(self, text: str) -> Dict[str, List[str]]:
+    async def _extract_entities(self, text: str) -> Dict[str, List[str]]:
         """
         Extract key entities from text.
         
@@ -192,35 +339,25 @@ REWRITTEN:
         
         prompt = f"""Extract the following entities from this text:
 
-Text: {text[:2000]}
+Text: {truncate_to_tokens(text, EXCERPT_TOKENS)}
 
 Provide your response in this exact format:
 PEOPLE: [comma-separated list of person names, or "none" if none found]
 ORGANIZATIONS: [comma-separated list of organization names, or "none" if none found]
 LOCATIONS: [comma-separated list of location names, or "none" if none found]"""
 
-        response = self._call_llm(prompt, system_prompt, max_tokens=500)
+        response = await self._call_llm(prompt, system_prompt, max_tokens=500)
         
         entities = {'people': [], 'organizations': [], 'locations': []}
         
-        for line in response.split('\n'):
-            line = line.strip()
-            if line.startswith('PEOPLE:'):
-                items = line.replace('PEOPLE:', '').strip()
-                if items.lower() != 'none':
-                    entities['people'] = [x.strip() for x in items.split(',') if x.strip()]
-            elif line.startswith('ORGANIZATIONS:'):
-                items = line.replace('ORGANIZATIONS:', '').strip()
-                if items.lower() != 'none':
-                    entities['organizations'] = [x.strip() for x in items.split(',') if x.strip()]
-            elif line.startswith('LOCATIONS:'):
-                items = line.replace('LOCATIONS:', '').strip()
-                if items.lower() != 'none':
-                    entities['locations'] = [x.strip() for x in items.split(',') if x.strip()]
+        for match in _ENTITY_RE.finditer(response):
+            items = match.group(2)
+            if items.lower() != 'none':
+                entities[_ENTITY_KEYS[match.group(1)]] = [x.strip() for x in items.split(',') if x.strip()]
         
         return entities
     
-    def _generate_hashtags(self, text: str, entities: Dict) -> List[str]:
+    async def _generate_hashtags(self, text: str, entities: Dict) -> List[str]:
         """Generate relevant hashtags for social media."""
         if not text:
             return []
@@ -244,12 +381,16 @@ Rules:
 
 Provide hashtags as a comma-separated list:"""
 
-        response = self._call_llm(prompt, system_prompt, max_tokens=200)
+        response = await self._call_llm(prompt, system_prompt, max_tokens=200)
         
-        # Parse hashtags
+        return self._normalize_hashtags(response.replace('\n', ',').split(','))
+    
+    @staticmethod
+    def _normalize_hashtags(tags: Iterable[str]) -> List[str]:
+        """Ensure every tag starts with '#' and cap the list at 8."""
         hashtags = []
-        for tag in response.replace('\n', ',').split(','):
-            tag = tag.strip()
+        for tag in tags:
+            tag = str(tag).strip()
             if tag.startswith('#'):
                 hashtags.append(tag)
             elif tag:
@@ -257,7 +398,7 @@ Provide hashtags as a comma-separated list:"""
         
         return hashtags[:8]  # Limit to 8 hashtags
     
-    def _generate_website_content(self, article: Dict, summary: str, rewritten: str) -> Dict:
+    async def _generate_website_content(self, article: Dict, summary: str, rewritten: str) -> Dict:
         """
         Generate professional website content.
         
@@ -276,7 +417,7 @@ Your writing style is:
 
 Original Title: {original_title}
 Summary: {summary}
-Content: {rewritten[:2000]}
+Content: {truncate_to_tokens(rewritten, EXCERPT_TOKENS)}
 
 Generate:
 1. An engaging, SEO-friendly headline (different from original)
@@ -297,9 +438,11 @@ PARAGRAPH_2:
 [second paragraph]
 
 PARAGRAPH_3:
-[third paragraph]"""
+[third paragraph]
+
+{END_MARKER}"""
 
-        response = self._call_llm(prompt, system_prompt)
+        response = await self._call_llm(prompt, system_prompt, stop_when=_website_content_complete)
         
         # Parse response
         result = {
@@ -308,32 +451,17 @@ PARAGRAPH_3:
             'paragraphs': []
         }
         
-        sections = {
-            'HEADLINE:': 'title',
-            'SUMMARY:': 'summary'
-        }
-        
-        current_section = None
-        lines = response.split('\n')
-        
-        for i, line in enumerate(lines):
-            line_stripped = line.strip()
-            
-            if line_stripped in ['HEADLINE:', 'SUMMARY:']:
-                current_section = sections.get(line_stripped)
-            elif line_stripped.startswith('PARAGRAPH_'):
-                # Collect remaining lines until next section
-                para_lines = []
-                for j in range(i + 1, len(lines)):
-                    if lines[j].strip().startswith('PARAGRAPH_') or lines[j].strip() in sections:
-                        break
-                    if lines[j].strip():
-                        para_lines.append(lines[j].strip())
-                if para_lines:
-                    result['paragraphs'].append(' '.join(para_lines))
-            elif current_section and line_stripped:
-                result[current_section] = line_stripped
-                current_section = None
+        for match in _SECTION_RE.finditer(response):
+            label = match.group(1)
+            lines = [line.strip() for line in match.group(2).split('\n') if line.strip()]
+            if not lines:
+                continue
+            if label == 'HEADLINE':
+                result['title'] = lines[0]
+            elif label == 'SUMMARY':
+                result['summary'] = lines[0]
+            else:
+                result['paragraphs'].append(' '.join(lines))
         
         # Ensure we have 3 paragraphs
         while len(result['paragraphs']) < 3:
@@ -341,7 +469,7 @@ PARAGRAPH_3:
         
         return result
     
-    def _generate_telegram_content(self, article: Dict, summary: str) -> Dict:
+    async def _generate_telegram_content(self, article: Dict, summary: str) -> Dict:
         """
         Generate conversational Telegram teaser.
         
@@ -370,11 +498,11 @@ Write a catchy 2-3 sentence teaser that:
 
 Just provide the teaser text, nothing else:"""
 
-        teaser = self._call_llm(prompt, system_prompt, max_tokens=300)
+        teaser = await self._call_llm(prompt, system_prompt, max_tokens=300)
         
         return {'teaser': teaser.strip()}
     
-    def _generate_instagram_content(self, article: Dict, summary: str, hashtags: List[str]) -> Dict:
+    async def _generate_instagram_content(self, article: Dict, summary: str, hashtags: List[str]) -> Dict:
         """
         Generate Instagram caption with hashtags.
         
@@ -403,16 +531,196 @@ Write a catchy 1-2 sentence caption that:
 
 Just provide the caption text, no hashtags:"""
 
-        caption = self._call_llm(prompt, system_prompt, max_tokens=200)
+        caption = await self._call_llm(prompt, system_prompt, max_tokens=200)
         
         return {
             'caption': caption.strip(),
             'hashtags': hashtags
         }
     
-    def process_article(self, article: Dict) -> Optional[Dict]:
+    async def _generate_social_content(self, article: Dict, summary: str, text: str) -> Tuple[Dict, List[str], Dict]:
+        """
+        Run the dependent entities -> hashtags -> Instagram steps in order.
+        
+        Returns:
+            Tuple of (entities, hashtags, instagram_content)
+        """
+        entities = await self._extract_entities(text)
+        hashtags = await self._generate_hashtags(summary, entities)
+        instagram_content = await self._generate_instagram_content(article, summary, hashtags)
+        return entities, hashtags, instagram_content
+    
+    async def _process_article_single_call(self, article: Dict) -> Optional[Dict]:
         """
-        Process a single article through the full curation pipeline.
+        Curate an article with one fused LLM call returning JSON.
+        
+        Returns:
+            Dict with 'curated' and 'platforms' sections, or None if the
+            article has no content or the response could not be parsed
+        """
+        title = article.get('title', '')
+        content = self._article_text(article)
+        
+        if not content:
+            return None
+        
+        # Truncate content if too long (to stay within token limits)
+        content = truncate_to_tokens(content, self.max_input_tokens)
+        
+        system_prompt = """You are a professional news editor and social media manager.
+You rewrite news articles in a fresh, original way to avoid plagiarism while keeping
+every fact accurate, and you adapt them for a website, Telegram and Instagram.
+Always respond with a single valid JSON object and nothing else."""
+
+        prompt = f"""Article Title: {title}
+
+Article Content:
+{content}
+
+Return a JSON object with exactly these keys:
+- "summary": a 2-3 sentence summary of the key points
+- "rewritten": a rewritten version of the article (3 paragraphs, keeping all important facts)
+- "entities": {{"people": [...], "organizations": [...], "locations": [...]}} (empty lists if none)
+- "hashtags": 5-8 hashtags starting with #, CamelCase for multi-word tags, mixing specific and broad
+- "website": {{"title": an engaging SEO-friendly headline different from the original,
+  "summary": a professional 2-3 sentence summary paragraph,
+  "paragraphs": three detailed, professional content paragraphs}}
+- "telegram": {{"teaser": a catchy, conversational 2-3 sentence teaser that starts with a relevant emoji and creates curiosity to read more}}
+- "instagram": {{"caption": a punchy 1-2 sentence caption that starts with an attention-grabbing emoji and encourages engagement, no hashtags}}"""
+
+        try:
+            response = await self._call_llm(prompt, system_prompt, max_tokens=SINGLE_CALL_MAX_TOKENS, json_mode=True)
+            data = fastjson.loads(response)
+        except Exception as e:
+            logger.warning("Single-call curation failed for '%.50s': %s", title, e)
+            return None
+        
+        if not isinstance(data, dict):
+            return None
+        
+        summary = str(data.get('summary') or '').strip()
+        rewritten = str(data.get('rewritten') or '').strip()
+        if not summary or not rewritten:
+            logger.warning("Single-call response missing summary/rewrite for '%.50s'", title)
+            return None
+        
+        raw_entities = data.get('entities') or {}
+        entities = {
+            key: [str(x).strip() for x in (raw_entities.get(key) or []) if str(x).strip()]
+            for key in ('people', 'organizations', 'locations')
+        }
+        hashtags = self._normalize_hashtags(data.get('hashtags') or [])
+        
+        website = data.get('website') or {}
+        paragraphs = [str(p).strip() for p in (website.get('paragraphs') or []) if str(p).strip()]
+        # Ensure we have 3 paragraphs
+        while len(paragraphs) < 3:
+            paragraphs.append(rewritten[:500])
+        
+        telegram = data.get('telegram') or {}
+        instagram = data.get('instagram') or {}
+        
+        return {
+            'curated': {
+                'summary': summary,
+                'rewritten_content': rewritten,
+                'entities': entities,
+                'hashtags': hashtags
+            },
+            'platforms': {
+                'website': {
+                    'title': str(website.get('title') or title).strip(),
+                    'summary': str(website.get('summary') or summary).strip(),
+                    'paragraphs': paragraphs
+                },
+                'telegram': {'teaser': str(telegram.get('teaser') or summary).strip()},
+                'instagram': {
+                    'caption': str(instagram.get('caption') or summary).strip(),
+                    'hashtags': hashtags
+                }
+            }
+        }
+    
+    async def _process_article_multi_call(self, article: Dict) -> Dict:
+        """
+        Curate an article with one LLM call per pipeline step.
+        
+        Returns:
+            Dict with 'curated' and 'platforms' sections
+        """
+        # Step 1: Summarize and rewrite
+        logger.debug("Step 1: Summarizing and rewriting...")
+        summary_result = await self._summarize_and_rewrite(article)
+        summary = summary_result['summary']
+        rewritten = summary_result['rewritten_content']
+        
+        if not rewritten:
+            # Nothing to build on: skip the remaining calls, which would
+            # only run on empty input
+            logger.debug("No rewritten content, skipping entity/hashtag/platform steps")
+            title = article.get('title', '')
+            return {
+                'curated': {
+                    'summary': summary,
+                    'rewritten_content': rewritten,
+                    'entities': {'people': [], 'organizations': [], 'locations': []},
+                    'hashtags': []
+                },
+                'platforms': {
+                    'website': {'title': title, 'summary': summary, 'paragraphs': [summary] * 3},
+                    'telegram': {'teaser': summary},
+                    'instagram': {'caption': summary, 'hashtags': []}
+                }
+            }
+        
+        # Steps 2-4 only depend on the summary/rewrite, so they fan out:
+        # website and telegram content run alongside the
+        # entities -> hashtags -> instagram chain
+        logger.debug("Steps 2-4: Generating entities, hashtags and platform content...")
+        content_for_entities = rewritten or self._article_text(article)
+        (entities, hashtags, instagram_content), website_content, telegram_content = await asyncio.gather(
+            self._generate_social_content(article, summary, content_for_entities),
+            self._generate_website_content(article, summary, rewritten),
+            self._generate_telegram_content(article, summary)
+        )
+        
+        return {
+            'curated': {
+                'summary': summary,
+                'rewritten_content': rewritten,
+                'entities': entities,
+                'hashtags': hashtags
+            },
+            'platforms': {
+                'website': website_content,
+                'telegram': telegram_content,
+                'instagram': instagram_content
+            }
+        }
+    
+    async def process_article(self, article: Dict) -> Optional[Dict]:
+        """
+        Process a single article through the full curation pipeline and save it.
+        
+        Args:
+            article: Raw article from database
+            
+        Returns:
+            Curated content dictionary or None if failed
+        """
+        try:
+            return await self._curate_article(article)
+        finally:
+            await asyncio.to_thread(self._flush_curated_updates)
+    
+    async def _curate_article(self, article: Dict) -> Optional[Dict]:
+        """
+        Curate a single article and queue its database update.
+        
+        Articles whose normalized text was already curated reuse that
+        result without any LLM calls. Otherwise tries the fused single-call
+        prompt first and falls back to the step-by-step pipeline if its
+        response cannot be used.
         
         Args:
             article: Raw article from database
@@ -423,59 +731,106 @@ Just provide the caption text, no hashtags:"""
         article_id = str(article.get('_id', ''))
         title = article.get('title', 'Unknown')[:50]
         
-        logger.info(f"Processing article: {title}...")
+        logger.info("Processing article: %s...", title)
         
         try:
-            # Step 1: Summarize and rewrite
-            logger.debug("Step 1: Summarizing and rewriting...")
-            summary_result = self._summarize_and_rewrite(article)
-            summary = summary_result['summary']
-            rewritten = summary_result['rewritten_content']
+            text = self._article_text(article)
+            content_hash = self._content_hash(text) if text else None
             
-            # Step 2: Extract entities
-            logger.debug("Step 2: Extracting entities...")
-            content_for_entities = rewritten or article.get('full_content', '') or article.get('content', '')
-            entities = self._extract_entities(content_for_entities)
+            content = None
+            if content_hash:
+                # Same story already curated (earlier in this run, a rerun or
+                # another feed); the database lookup runs in a worker thread
+                # so other articles' LLM calls keep going meanwhile
+                duplicate = next((data for _, data in self._pending_updates
+                                  if data.get('content_hash') == content_hash), None)
+                if duplicate is None:
+                    duplicate = await asyncio.to_thread(self.db.find_curated_by_content_hash, content_hash)
+                if duplicate:
+                    logger.info("Reusing curated content of identical article for: %s", title)
+                    content = {'curated': duplicate['curated'], 'platforms': duplicate.get('platforms', {})}
             
-            # Step 3: Generate hashtags
-            logger.debug("Step 3: Generating hashtags...")
-            hashtags = self._generate_hashtags(summary, entities)
-            
-            # Step 4: Generate platform-specific content
-            logger.debug("Step 4: Generating platform content...")
-            website_content = self._generate_website_content(article, summary, rewritten)
-            telegram_content = self._generate_telegram_content(article, summary)
-            instagram_content = self._generate_instagram_content(article, summary, hashtags)
+            if content is None and self.single_call:
+                content = await self._process_article_single_call(article)
+                if content is None:
+                    logger.info("Falling back to step-by-step curation for: %s", title)
+            if content is None:
+                content = await self._process_article_multi_call(article)
             
             # Compile results
             curated_data = {
-                'curated': {
-                    'summary': summary,
-                    'rewritten_content': rewritten,
-                    'entities': entities,
-                    'hashtags': hashtags
-                },
-                'platforms': {
-                    'website': website_content,
-                    'telegram': telegram_content,
-                    'instagram': instagram_content
-                },
-                'processed_at': datetime.utcnow()
+                **content,
+                'processed_at': datetime.now(timezone.utc)
             }
+            if content_hash:
+                curated_data['content_hash'] = content_hash
             
-            # Update database
-            success = self.db.update_article_curated_content(article_id, curated_data)
-            if success:
-                logger.info(f"Successfully processed: {title}")
-            else:
-                logger.warning(f"Failed to update database for: {title}")
+            # Written in one bulk_write by _flush_curated_updates()
+            self._pending_updates.append((article_id, curated_data))
+            logger.info("Successfully processed: %s", title)
             
             return curated_data
             
         except Exception as e:
-            logger.error(f"Failed to process article {title}: {e}")
+            logger.error("Failed to process article %s: %s", title, e)
             return None
     
+    def _flush_curated_updates(self):
+        """Write all queued curated-content updates in a single round trip."""
+        if not self._pending_updates:
+            return
+        
+        updates, self._pending_updates = self._pending_updates, []
+        updated = self.db.bulk_update_article_curated_content(updates)
+        if updated == len(updates):
+            logger.info("Updated %d articles with curated content", updated)
+        else:
+            logger.warning("Updated only %d of %d articles with curated content", updated, len(updates))
+    
+    async def _process_stream(self, articles: Iterator[Dict]) -> List[Optional[Dict]]:
+        """
+        Process articles concurrently as they are read from the database.
+        
+        A producer pulls articles from the (blocking) cursor in a worker
+        thread and queues them; consumers process them as they arrive, so
+        the first LLM calls start before the cursor is drained.
+        
+        Args:
+            articles: Iterator of raw articles (typically a MongoDB cursor)
+            
+        Returns:
+            Per-article results in completion order (None for failures)
+        """
+        # Created here so it binds to the running loop
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_concurrency * 2)
+        loop = asyncio.get_running_loop()
+        results: List[Optional[Dict]] = []
+        
+        async def produce():
+            count = 0
+            try:
+                while True:
+                    article = await loop.run_in_executor(None, next, articles, None)
+                    if article is None:
+                        break
+                    count += 1
+                    await queue.put((count, article))
+            finally:
+                for _ in range(self.max_concurrency):
+                    await queue.put(None)
+        
+        async def consume():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                i, article = item
+                logger.info("[%d] Processing article...", i)
+                results.append(await self._curate_article(article))
+        
+        await asyncio.gather(produce(), *(consume() for _ in range(self.max_concurrency)))
+        return results
+    
     def run(self, batch_size: int = None) -> Dict[str, Any]:
         """
         Run the content curation agent on raw articles.
@@ -487,14 +842,18 @@ Just provide the caption text, no hashtags:"""
             Summary of processing results
         """
         batch_size = batch_size or self.batch_size
-        start_time = datetime.utcnow()
+        start_time = time.perf_counter()
         
-        logger.info(f"Starting content curation (batch size: {batch_size})")
+        logger.info("Starting content curation (batch size: %d)", batch_size)
         
-        # Fetch raw articles
-        raw_articles = self.db.get_raw_articles(limit=batch_size)
+        # Stream raw articles straight into the processing pipeline
+        raw_articles = self.db.iter_raw_articles(limit=batch_size)
+        try:
+            results = self._loop.run_until_complete(self._process_stream(raw_articles))
+        finally:
+            self._flush_curated_updates()
         
-        if not raw_articles:
+        if not results:
             logger.info("No raw articles to process")
             return {
                 'processed': 0,
@@ -503,38 +862,31 @@ Just provide the caption text, no hashtags:"""
                 'duration_seconds': 0
             }
         
-        logger.info(f"Found {len(raw_articles)} raw articles to process")
-        
-        processed = 0
-        failed = 0
-        
-        for i, article in enumerate(raw_articles, 1):
-            logger.info(f"[{i}/{len(raw_articles)}] Processing article...")
-            
-            result = self.process_article(article)
-            if result:
-                processed += 1
-            else:
-                failed += 1
+        processed = sum(1 for result in results if result)
+        failed = len(results) - processed
         
-        duration = (datetime.utcnow() - start_time).total_seconds()
+        duration = time.perf_counter() - start_time
         
         summary = {
             'processed': processed,
             'failed': failed,
-            'total_raw': len(raw_articles),
+            'total_raw': len(results),
             'duration_seconds': round(duration, 2)
         }
         
-        logger.info(f"Content curation complete: {processed} processed, {failed} failed in {duration:.1f}s")
+        logger.info("Content curation complete: %d processed, %d failed in %.1fs", processed, failed, duration)
         
         return summary
     
     def close(self):
         """Clean up resources."""
-        if self.db:
-            self.db.disconnect()
-            logger.info("Content curation agent closed")
+        if not self._loop.is_closed():
+            self._loop.run_until_complete(self.groq_client.close())
+            self._loop.close()
+        # The MongoDB connection is shared process-wide (see agents._clients)
+        # and is closed at exit
+        self.db = None
+        logger.info("Content curation agent closed")
 
 
 # For running as a standalone script
@@ -10,26 +10,75 @@ Pipeline:
 5. Update database with image paths
 """
 
+import asyncio
 import logging
 import time
-import yaml
 import os
+import random
+import re
 import hashlib
 import urllib.parse
-import requests
-from typing import Dict, List, Any, Optional
-from datetime import datetime
+import aiohttp
+from collections import OrderedDict
+from typing import Awaitable, Dict, List, Any, Optional, Tuple
+from datetime import datetime, timezone
 from pathlib import Path
 
-from groq import Groq
+from groq import AsyncGroq
+
+try:
+    import xxhash
+except ImportError:  # optional accelerator
+    xxhash = None
 
 import sys
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Running as a script (python agents/<name>.py) puts agents/ rather than the
+# project root on sys.path; package imports need no adjustment
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents._clients import get_async_groq, get_http_session, get_mongo, run_coroutine
 from database.mongodb import MongoDBManager
+from utils import fastjson
+from utils.config import load_config
+from utils.rate_limiter import AsyncTokenBucket
 
 logger = logging.getLogger(__name__)
 
+# Image responses are read in chunks of this size and abandoned early if
+# they turn out not to be an image or grow past MAX_IMAGE_BYTES. Anything
+# under MIN_IMAGE_BYTES is an error placeholder rather than a real image.
+IMAGE_CHUNK_SIZE = 64 * 1024
+MIN_IMAGE_BYTES = 1000
+MAX_IMAGE_BYTES = 20 * 1024 * 1024
+
+# Images kept per run for reuse by identical (prompt, width, height) requests
+IMAGE_MEMO_SIZE = 32
+IMAGE_SIGNATURES = (b'\xff\xd8\xff', b'\x89PNG', b'RIFF', b'GIF8')
+
+# Seconds the aiohttp connector caches DNS lookups (aiohttp's default is 10)
+DNS_CACHE_TTL = 300
+
+# Article fields image generation reads (title and curated summary/entities
+# for the prompts, the retry count for retries)
+ARTICLE_FIELDS = {
+    'title': 1,
+    'curated.summary': 1,
+    'curated.entities': 1,
+    'image_retry_count': 1,
+}
+
+
+def _backoff(base: float, attempt: int) -> float:
+    """
+    Seconds to wait before retry `attempt` (0-based).
+    
+    Full jitter over the exponential window, so concurrent workers that
+    failed together do not all retry at the same moment.
+    """
+    return random.uniform(0, base * 2 ** attempt) + 0.5
+
 
 class ImageCreationAgent:
     """
@@ -46,6 +95,9 @@ class ImageCreationAgent:
     # Pollinations.ai API base URL
     POLLINATIONS_API = "https://image.pollinations.ai/prompt"
     
+    # "PROMPT_n: ..." lines in the LLM's image prompt response
+    _PROMPT_RE = re.compile(r'^[ \t]*PROMPT_([123]):[ \t]*(\S.*?)\s*$', re.M)
+    
     def __init__(self, config_path: str = "config.yaml"):
         """
         Initialize the image creation agent.
@@ -63,6 +115,18 @@ class ImageCreationAgent:
         self.output_dir = img_config.get('OUTPUT_DIR', 'generated_images')
         self.batch_size = img_config.get('BATCH_SIZE', 10)
         self.delay_between_calls = img_config.get('DELAY_BETWEEN_CALLS', 1)
+        self.concurrency = img_config.get('CONCURRENCY', 4)
+        
+        # Pollinations requests are paced by a token bucket: bursts of up to
+        # BATCH_SIZE requests, then one every DELAY_BETWEEN_CALLS seconds on
+        # average, instead of sleeping after every call
+        self.image_limiter = (
+            AsyncTokenBucket(rate=1 / self.delay_between_calls, capacity=self.batch_size)
+            if self.delay_between_calls > 0 else None
+        )
+        # Groq prompt generation: LLM.RPM requests/minute with a small burst
+        rpm = self.config.get('LLM', {}).get('RPM', 30)
+        self.llm_limiter = AsyncTokenBucket(rate=rpm / 60, capacity=5)
         
         # Platform-specific dimensions
         self.dimensions = {
@@ -102,41 +166,50 @@ class ImageCreationAgent:
                 self.imagekit_enabled = False
                 self.imagekit_client = None
         
+        # Groq calls and image downloads run concurrently on the event loop
+        # shared by all agents in the process (see agents._clients). The
+        # async Groq client and the aiohttp session are bound to that loop;
+        # the session, and its keep-alive pool, is also shared by every
+        # ImageCreationAgent, so instances created per orchestrator cycle
+        # reuse its connections.
+        # (article_id, image_data) pairs awaiting one bulk write per run
+        self._pending_updates: List[Tuple[str, Dict]] = []
+        # (prompt, width, height) -> download task, see _fetch_image_bytes()
+        self._image_memo: 'OrderedDict[Tuple[str, int, int], asyncio.Future]' = OrderedDict()
+        
         # Create output directory
         self._ensure_output_dir()
         
     def _load_config(self, config_path: str) -> Dict:
         """Load configuration from YAML file."""
         try:
-            with open(config_path, 'r') as f:
-                return yaml.safe_load(f)
+            return load_config(config_path)
         except Exception as e:
             logger.error(f"Failed to load config: {e}")
             raise
     
-    def _init_llm(self) -> Groq:
-        """Initialize Groq LLM client for prompt generation."""
+    def _init_llm(self) -> AsyncGroq:
+        """Initialize async Groq LLM client for prompt generation."""
         llm_config = self.config.get('LLM', {})
         api_key = llm_config.get('API_KEY')
         
         if not api_key or api_key == "your_groq_api_key_here":
             raise ValueError("Please set your Groq API key in config.yaml")
         
-        client = Groq(api_key=api_key)
+        # Shared with later runs; its pool is bound to the shared event loop
+        # this agent's coroutines run on
+        client = get_async_groq(api_key)
         logger.info("Groq LLM client initialized for image prompt generation")
         return client
     
     def _init_database(self) -> MongoDBManager:
         """Initialize MongoDB connection."""
         mongo_config = self.config['MONGODB']
-        db = MongoDBManager(
-            connection_url=mongo_config['CONNECTION_URL'],
-            database_name=mongo_config['DATABASE_NAME'],
-            collection_name=mongo_config['COLLECTION_NAME']
+        return get_mongo(
+            mongo_config['CONNECTION_URL'],
+            mongo_config['DATABASE_NAME'],
+            mongo_config['COLLECTION_NAME']
         )
-        if not db.connect():
-            raise ConnectionError("Failed to connect to MongoDB")
-        return db
     
     def _ensure_output_dir(self):
         """Create output directory if it doesn't exist."""
@@ -269,7 +342,7 @@ class ImageCreationAgent:
         
         return None
     
-    def _call_llm(self, prompt: str, system_prompt: str = None, max_tokens: int = 500) -> str:
+    async def _call_llm(self, prompt: str, system_prompt: str = None, max_tokens: int = 500) -> str:
         """
         Make a call to the Groq LLM with rate limit handling.
         
@@ -293,23 +366,21 @@ class ImageCreationAgent:
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                response = self.groq_client.chat.completions.create(
+                await self.llm_limiter.acquire()
+                response = await self.groq_client.chat.completions.create(
                     model=model,
                     messages=messages,
                     temperature=temperature,
                     max_tokens=max_tokens
                 )
                 
-                # Add delay after successful call to avoid rate limits
-                time.sleep(2)
-                
                 return response.choices[0].message.content.strip()
             except Exception as e:
                 error_str = str(e).lower()
                 if 'rate_limit' in error_str or 'rate limit' in error_str:
-                    wait_time = (2 ** attempt) * 10  # 10, 20, 40 seconds
-                    logger.warning(f"Rate limit hit, waiting {wait_time}s before retry (attempt {attempt+1}/{max_retries})")
-                    time.sleep(wait_time)
+                    wait_time = _backoff(10, attempt)  # up to 10, 20, 40 seconds
+                    logger.warning(f"Rate limit hit, waiting {wait_time:.1f}s before retry (attempt {attempt+1}/{max_retries})")
+                    await asyncio.sleep(wait_time)
                     continue
                 else:
                     logger.error(f"LLM call failed: {e}")
@@ -318,7 +389,7 @@ class ImageCreationAgent:
         logger.error("All LLM retry attempts exhausted due to rate limits")
         raise Exception("Rate limit exceeded after all retries")
     
-    def _generate_image_prompts(self, article: Dict) -> List[str]:
+    async def _generate_image_prompts(self, article: Dict) -> List[str]:
         """
         Generate 3 creative image prompts based on article content.
         
@@ -334,6 +405,16 @@ class ImageCreationAgent:
         summary = curated.get('summary', '')
         entities = curated.get('entities', {})
         
+        # Retries and re-curated duplicates see the same inputs again, so
+        # reuse their prompts instead of another Groq call
+        cache_key = hashlib.sha1(
+            fastjson.dumps({'t': title, 's': summary, 'e': entities}, sort_keys=True).encode()
+        ).hexdigest()
+        cached = await asyncio.to_thread(self.db.get_cached_image_prompts, cache_key)
+        if cached and len(cached) >= 3:
+            logger.info("Using cached image prompts")
+            return cached[:3]
+        
         # Build context for LLM
         people = ', '.join(entities.get('people', [])[:3]) or 'None mentioned'
         orgs = ', '.join(entities.get('organizations', [])[:3]) or 'N/A'
@@ -384,25 +465,20 @@ PROMPT_1: [realistic photo description]
 PROMPT_2: [realistic photo description]  
 PROMPT_3: [realistic photo description]"""
 
-        response = self._call_llm(prompt, system_prompt)
-        
-        # Parse prompts from response
-        prompts = []
+        response = await self._call_llm(prompt, system_prompt)
         
         # Quality suffix optimized for turbo model
         quality_suffix = ", professional photography, realistic, high quality, sharp focus, natural lighting, photojournalism style"
         
-        for line in response.split('\n'):
-            line = line.strip()
-            for prefix in ['PROMPT_1:', 'PROMPT_2:', 'PROMPT_3:']:
-                if line.startswith(prefix):
-                    prompt_text = line.replace(prefix, '').strip()
-                    if prompt_text:
-                        # Add quality keywords
-                        prompt_text = prompt_text + quality_suffix
-                        prompts.append(prompt_text)
-                    break
-
+        # Parse prompts from response, adding quality keywords; keyed by
+        # number so prompts the LLM emits out of order land in their slot
+        prompts_by_idx = {int(m.group(1)): m.group(2) + quality_suffix
+                          for m in self._PROMPT_RE.finditer(response)}
+        prompts = [prompts_by_idx[i] for i in sorted(prompts_by_idx)]
+        
+        # Only a complete LLM answer is worth caching; fallbacks are cheap
+        if len(prompts) >= 3:
+            await asyncio.to_thread(self.db.cache_image_prompts, cache_key, prompts[:3])
         
         # Ensure we have 3 prompts
         while len(prompts) < 3:
@@ -414,35 +490,84 @@ PROMPT_3: [realistic photo description]"""
     
     def _generate_article_id_hash(self, article_id: str) -> str:
         """Generate a short hash for article ID to use in filenames."""
-        return hashlib.md5(article_id.encode()).hexdigest()[:8]
+        if xxhash is not None:
+            return xxhash.xxh64(article_id.encode()).hexdigest()[:8]
+        return hashlib.blake2s(article_id.encode(), digest_size=4).hexdigest()
+    
+    async def _get_http(self) -> aiohttp.ClientSession:
+        """Return the shared aiohttp session (created on first use)."""
+        # Three downloads in flight per concurrently processed article, and
+        # every download goes to the same host, so cache its DNS entry
+        return await get_http_session("images", limit=self.concurrency * 3, dns_cache_ttl=DNS_CACHE_TTL)
     
-    def _download_image(self, prompt: str, width: int, height: int, 
-                        image_name: str, seed: int = None, max_retries: int = 3) -> Optional[str]:
+    async def _fetch_image_bytes(self, session: aiohttp.ClientSession, prompt: str, width: int,
+                                 height: int, image_name: str, seed: int = None) -> Optional[bytes]:
         """
-        Download an image from Pollinations.ai API and upload to ImageKit.
+        Generate an image, reusing the result of an identical request made
+        earlier in the run (e.g. two articles falling back to the same prompt).
+        
+        Identical requests that are still in flight share the one download.
+        Only the last IMAGE_MEMO_SIZE successful images are kept.
         
         Args:
+            session: aiohttp session to issue the request on
             prompt: Image generation prompt
             width: Image width in pixels
             height: Image height in pixels
-            image_name: Name for the image (used in ImageKit)
+            image_name: Name for the image (for logging)
+            seed: Optional seed (not part of the memo key)
+            
+        Returns:
+            Image bytes if successful, None otherwise
+        """
+        key = (prompt, width, height)
+        task = self._image_memo.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._request_image_bytes(session, prompt, width, height, image_name, seed)
+            )
+            self._image_memo[key] = task
+            if len(self._image_memo) > IMAGE_MEMO_SIZE:
+                self._image_memo.popitem(last=False)
+        else:
+            self._image_memo.move_to_end(key)
+            logger.info(f"Reusing image generated for an identical prompt: {image_name}")
+        
+        # Shielded so a cancelled caller does not cancel a shared download
+        content = await asyncio.shield(task)
+        if content is None and self._image_memo.get(key) is task:
+            del self._image_memo[key]
+        return content
+    
+    async def _request_image_bytes(self, session: aiohttp.ClientSession, prompt: str, width: int,
+                                   height: int, image_name: str, seed: int = None,
+                                   max_retries: int = 3) -> Optional[bytes]:
+        """
+        Generate an image with Pollinations.ai, retrying and falling back across models.
+        
+        Args:
+            session: aiohttp session to issue the request on
+            prompt: Image generation prompt
+            width: Image width in pixels
+            height: Image height in pixels
+            image_name: Name for the image (for logging)
             seed: Optional seed for reproducibility
-            max_retries: Maximum number of retry attempts
+            max_retries: Maximum number of retry attempts per model
             
         Returns:
-            ImageKit URL if successful, None otherwise
+            Image bytes if successful, None otherwise
         """
         # Models to try in order of preference - turbo is more stable, flux for quality
         models_to_try = ['turbo', 'flux', 'seedream']
+        timeout = aiohttp.ClientTimeout(total=180)
+        
+        # Encode prompt for URL once; a '/' in the prompt must not split the path
+        url = f"{self.POLLINATIONS_API}/{urllib.parse.quote(prompt, safe='')}"
         
         for model in models_to_try:
             for attempt in range(max_retries):
                 try:
-                    # Encode prompt for URL
-                    encoded_prompt = urllib.parse.quote(prompt)
-                    
-                    # Build URL with parameters
-                    url = f"{self.POLLINATIONS_API}/{encoded_prompt}"
+                    # Only the model and seed vary between attempts
                     params = {
                         'width': width,
                         'height': height,
@@ -454,35 +579,33 @@ PROMPT_3: [realistic photo description]"""
                     
                     # Make request with longer timeout
                     logger.debug(f"Requesting image (model={model}, attempt={attempt+1}): {prompt[:50]}...")
-                    response = requests.get(url, params=params, timeout=180)
+                    if self.image_limiter:
+                        await self.image_limiter.acquire()
+                    async with session.get(url, params=params, timeout=timeout) as response:
+                        status = response.status
+                        content = await self._read_image_body(response) if status == 200 else b''
                     
-                    if response.status_code == 200:
+                    if status == 200:
                         # Verify we got actual image data
-                        if len(response.content) > 1000:  # Valid images are larger
+                        if len(content) > MIN_IMAGE_BYTES:
                             logger.info(f"Generated image (model={model}): {image_name}")
-                            
-                            # Upload directly to ImageKit
-                            imagekit_url = self._upload_bytes_to_imagekit(response.content, image_name)
-                            if imagekit_url:
-                                return imagekit_url
-                            else:
-                                logger.warning("ImageKit upload failed, retrying...")
+                            return content
                         else:
                             logger.warning(f"Response too small, retrying...")
-                    elif response.status_code in [502, 503, 504]:
+                    elif status in [502, 503, 504]:
                         # Server errors - retry with exponential backoff
-                        wait_time = (2 ** attempt) * 2  # 2, 4, 8 seconds
-                        logger.warning(f"HTTP {response.status_code}, retrying in {wait_time}s (attempt {attempt+1}/{max_retries})")
-                        time.sleep(wait_time)
+                        wait_time = _backoff(2, attempt)  # up to 2, 4, 8 seconds
+                        logger.warning(f"HTTP {status}, retrying in {wait_time:.1f}s (attempt {attempt+1}/{max_retries})")
+                        await asyncio.sleep(wait_time)
                         continue
                     else:
-                        logger.error(f"Failed to generate image: HTTP {response.status_code}")
+                        logger.error(f"Failed to generate image: HTTP {status}")
                         break  # Don't retry on other errors, try next model
                         
-                except requests.exceptions.Timeout:
-                    wait_time = (2 ** attempt) * 2
-                    logger.warning(f"Timeout, retrying in {wait_time}s (attempt {attempt+1}/{max_retries})")
-                    time.sleep(wait_time)
+                except asyncio.TimeoutError:
+                    wait_time = _backoff(2, attempt)
+                    logger.warning(f"Timeout, retrying in {wait_time:.1f}s (attempt {attempt+1}/{max_retries})")
+                    await asyncio.sleep(wait_time)
                     continue
                 except Exception as e:
                     logger.error(f"Error downloading image: {e}")
@@ -494,9 +617,73 @@ PROMPT_3: [realistic photo description]"""
         logger.error(f"All models and retries exhausted for image generation")
         return None
     
-    def _generate_images_for_article(self, article: Dict, prompts: List[str]) -> Dict[str, Any]:
+    @staticmethod
+    async def _read_image_body(response: aiohttp.ClientResponse) -> bytes:
+        """
+        Read an image response body chunk by chunk.
+        
+        Rejects the response from its headers when they already show it
+        is not a usable image, stops at the first chunk if the payload is
+        not an image (e.g. an HTML error page) and caps the size at
+        MAX_IMAGE_BYTES.
+        
+        Returns:
+            The image bytes, or b'' if the body was rejected
+        """
+        content_type = response.headers.get('Content-Type', '')
+        if content_type and not content_type.startswith('image/'):
+            logger.warning(f"Response is {content_type}, not an image, skipping body")
+            return b''
+        length = response.content_length
+        if length is not None and not MIN_IMAGE_BYTES < length <= MAX_IMAGE_BYTES:
+            logger.warning(f"Response size {length} bytes is not a usable image, skipping body")
+            return b''
+        
+        body = bytearray()
+        checked = False
+        async for chunk in response.content.iter_chunked(IMAGE_CHUNK_SIZE):
+            body.extend(chunk)
+            if not checked and len(body) >= 4:
+                if not bytes(body[:4]).startswith(IMAGE_SIGNATURES):
+                    logger.warning("Response is not an image, skipping body")
+                    return b''
+                checked = True
+            if len(body) > MAX_IMAGE_BYTES:
+                logger.warning(f"Image larger than {MAX_IMAGE_BYTES} bytes, skipping")
+                return b''
+        return bytes(body)
+    
+    async def _upload_async(self, image_bytes: bytes, image_name: str) -> Optional[str]:
+        """Upload to ImageKit off the event loop (the SDK call blocks)."""
+        imagekit_url = await asyncio.to_thread(self._upload_bytes_to_imagekit, image_bytes, image_name)
+        if not imagekit_url:
+            logger.warning(f"ImageKit upload failed for {image_name}")
+        return imagekit_url
+    
+    async def _download_image_async(self, session: aiohttp.ClientSession, prompt: str, width: int,
+                                    height: int, image_name: str, seed: int = None) -> Optional[str]:
+        """
+        Download an image from Pollinations.ai API and upload to ImageKit.
+        
+        Args:
+            session: aiohttp session to issue the request on
+            prompt: Image generation prompt
+            width: Image width in pixels
+            height: Image height in pixels
+            image_name: Name for the image (used in ImageKit)
+            seed: Optional seed for reproducibility
+            
+        Returns:
+            ImageKit URL if successful, None otherwise
+        """
+        content = await self._fetch_image_bytes(session, prompt, width, height, image_name, seed)
+        if content is None:
+            return None
+        return await self._upload_async(content, image_name)
+    
+    async def _generate_images_for_article_async(self, article: Dict, prompts: List[str]) -> Dict[str, Any]:
         """
-        Generate all images for an article and upload directly to ImageKit.
+        Generate all images for an article concurrently and upload them to ImageKit.
         
         Generates 3 unique images:
         - Image 1: Website + Instagram (landscape)
@@ -520,82 +707,106 @@ PROMPT_3: [realistic photo description]"""
         }
         
         # Generate timestamp-based seed for reproducibility
-        base_seed = int(datetime.utcnow().timestamp())
-        
-        # Generate Image 1: Website (landscape) - will also be used for Instagram
-        logger.info("Generating image 1 (website)...")
-        
-        img1_url = self._download_image(
-            prompt=prompts[0],
-            width=self.dimensions['website']['width'],
-            height=self.dimensions['website']['height'],
-            image_name=f"{article_hash}_website",
-            seed=base_seed
+        base_seed = time.time_ns() & 0xFFFFFFFF
+        
+        web_dim = self.dimensions['website']
+        tg_dim = self.dimensions['telegram']
+        ig_dim = self.dimensions['instagram']
+        
+        # The three images are independent, so request them all at once;
+        # the article then waits for the slowest one rather than their sum
+        logger.info("Generating images 1-3 (website, telegram, instagram)...")
+        session = await self._get_http()
+        img1_url, img2_url, img3_url = await asyncio.gather(
+            self._download_image_async(
+                session,
+                prompt=prompts[0],
+                width=web_dim['width'],
+                height=web_dim['height'],
+                image_name=f"{article_hash}_website",
+                seed=base_seed
+            ),
+            self._download_image_async(
+                session,
+                prompt=prompts[1],
+                width=tg_dim['width'],
+                height=tg_dim['height'],
+                image_name=f"{article_hash}_telegram",
+                seed=base_seed + 1
+            ),
+            self._download_image_async(
+                session,
+                prompt=prompts[2],
+                width=ig_dim['width'],
+                height=ig_dim['height'],
+                image_name=f"{article_hash}_instagram",
+                seed=base_seed + 2
+            )
         )
+        
+        # Image 1: Website (landscape) - also used for Instagram
         if img1_url:
             images['website'] = {
                 'url': img1_url,  # ImageKit cloud URL
                 'prompt': prompts[0],
-                'dimensions': self.dimensions['website']
+                'dimensions': web_dim
             }
-            # Also add to Instagram
-            images['instagram'].append({
-                'url': img1_url,
-                'prompt': prompts[0],
-                'dimensions': self.dimensions['website']
-            })
-        
-        time.sleep(self.delay_between_calls)
         
-        # Generate Image 2: Telegram (square) - also for Instagram
-        logger.info("Generating image 2 (telegram)...")
-        
-        img2_url = self._download_image(
-            prompt=prompts[1],
-            width=self.dimensions['telegram']['width'],
-            height=self.dimensions['telegram']['height'],
-            image_name=f"{article_hash}_telegram",
-            seed=base_seed + 1
-        )
+        # Image 2: Telegram (square)
         if img2_url:
             images['telegram'] = {
                 'url': img2_url,  # ImageKit cloud URL
                 'prompt': prompts[1],
-                'dimensions': self.dimensions['telegram']
+                'dimensions': tg_dim
             }
-            images['instagram'].append({
-                'url': img2_url,
-                'prompt': prompts[1],
-                'dimensions': self.dimensions['telegram']
-            })
-        
-        time.sleep(self.delay_between_calls)
         
-        # Generate Image 3: Instagram portrait
-        logger.info("Generating image 3 (instagram)...")
+        # (url, prompt, dimensions) for the Instagram carousel, in order:
+        # image 1 (landscape, shared with the website), image 2 (square,
+        # shared with Telegram), image 3
+        carousel = [
+            (img1_url, prompts[0], web_dim),
+            (img2_url, prompts[1], tg_dim),
+            (img3_url, prompts[2], ig_dim)
+        ]
         
-        img3_url = self._download_image(
-            prompt=prompts[2],
-            width=self.dimensions['instagram']['width'],
-            height=self.dimensions['instagram']['height'],
-            image_name=f"{article_hash}_instagram",
-            seed=base_seed + 2
-        )
-        if img3_url:
-            images['instagram'].append({
-                'url': img3_url,  # ImageKit cloud URL
-                'prompt': prompts[2],
-                'dimensions': self.dimensions['instagram']
-            })
+        images['instagram'] = [
+            {'url': url, 'prompt': prompt, 'dimensions': dims}
+            for url, prompt, dims in carousel if url
+        ]
         
         return images
     
-    def process_article(self, article: Dict) -> Optional[Dict]:
+    def _generate_images_for_article(self, article: Dict, prompts: List[str]) -> Dict[str, Any]:
+        """Generate all images for an article (blocking wrapper around the async version)."""
+        return run_coroutine(self._generate_images_for_article_async(article, prompts))
+    
+    async def _prepare_article_async(self, article: Dict) -> List[str]:
+        """
+        Generate an article's image prompts.
+        
+        Args:
+            article: Article claimed from database (with curated content)
+            
+        Returns:
+            List of 3 image generation prompts
+        """
+        logger.debug("Generating image prompts...")
+        prompts = await self._generate_image_prompts(article)
+        logger.info(f"Generated {len(prompts)} image prompts")
+        return prompts
+    
+    async def _process_article_async(self, article: Dict,
+                                     prompts_task: Optional[Awaitable[List[str]]] = None) -> Optional[Dict]:
         """
         Process a single article to generate images.
         
+        Blocking MongoDB writes run in worker threads so other articles'
+        Groq calls and downloads keep going meanwhile.
+        
         Args:
             article: Article from database (with curated content)
+            prompts_task: Already started _prepare_article_async() for the
+                article (started here if None)
             
         Returns:
             Image metadata dictionary or None if failed
@@ -606,20 +817,14 @@ PROMPT_3: [realistic photo description]"""
         logger.info(f"Processing images for: {title}...")
         
         try:
-            # Mark article as generating images
-            self.db.mark_article_generating_images(article_id)
-            
             # Step 1: Generate image prompts using LLM
-            logger.debug("Generating image prompts...")
-            prompts = self._generate_image_prompts(article)
-            logger.info(f"Generated {len(prompts)} image prompts")
-            
-            # Rate limit delay after LLM call
-            time.sleep(self.delay_between_calls)
+            if prompts_task is None:
+                prompts_task = self._prepare_article_async(article)
+            prompts = await prompts_task
             
             # Step 2: Generate images
             logger.debug("Generating images...")
-            images = self._generate_images_for_article(article, prompts)
+            images = await self._generate_images_for_article_async(article, prompts)
             
             # Count successful generations
             success_count = 0
@@ -631,18 +836,15 @@ PROMPT_3: [realistic photo description]"""
             
             logger.info(f"Generated {success_count} images for article")
             
-            # Step 3: Update database
+            # Step 3: Queue the database update
             image_data = {
                 'images': images,
                 'image_prompts': prompts,
-                'images_generated_at': datetime.utcnow()
+                'images_generated_at': datetime.now(timezone.utc)
             }
             
-            success = self.db.update_article_images(article_id, image_data)
-            if success:
-                logger.info(f"Successfully updated article with images: {title}")
-            else:
-                logger.warning(f"Failed to update database for: {title}")
+            # Written in one bulk_write by _flush_image_updates()
+            self._pending_updates.append((article_id, image_data))
             
             return images
             
@@ -650,6 +852,67 @@ PROMPT_3: [realistic photo description]"""
             logger.error(f"Failed to generate images for {title}: {e}")
             return None
     
+    def process_article(self, article: Dict) -> Optional[Dict]:
+        """
+        Process a single article to generate images.
+        
+        Args:
+            article: Article from database (with curated content)
+            
+        Returns:
+            Image metadata dictionary or None if failed
+        """
+        try:
+            return run_coroutine(self._process_article_async(article))
+        finally:
+            self._flush_image_updates()
+    
+    def _flush_image_updates(self):
+        """Write all queued article image updates in a single round trip."""
+        if not self._pending_updates:
+            return
+        
+        updates, self._pending_updates = self._pending_updates, []
+        updated = self.db.bulk_update_article_images(updates)
+        if updated == len(updates):
+            logger.info(f"Updated {updated} articles with images")
+        else:
+            logger.warning(f"Updated only {updated} of {len(updates)} articles with images")
+    
+    async def _process_batch(self, articles: List[Dict]) -> List[Optional[Dict]]:
+        """
+        Process articles concurrently, at most CONCURRENCY at a time.
+        
+        Prompt generation for the whole batch starts up front (paced only
+        by the Groq limiter), so each article's prompts are usually ready
+        by the time a download slot frees up and Groq latency hides behind
+        other articles' downloads.
+        
+        Args:
+            articles: Articles ready for image generation
+            
+        Returns:
+            Per-article results in input order (None for failures)
+        """
+        # Stage 1: prompts for every article, all in flight at once
+        prompt_tasks = [asyncio.ensure_future(self._prepare_article_async(article)) for article in articles]
+        
+        # Stage 2: images, each article starting as soon as its prompts are
+        # ready and a slot is free (semaphore created here so it binds to
+        # the running loop)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        total = len(articles)
+        
+        async def process(i: int, article: Dict, prompts_task: asyncio.Future) -> Optional[Dict]:
+            async with semaphore:
+                logger.info(f"[{i}/{total}] Generating images...")
+                return await self._process_article_async(article, prompts_task)
+        
+        return await asyncio.gather(*(
+            process(i, article, task)
+            for i, (article, task) in enumerate(zip(articles, prompt_tasks), 1)
+        ))
+    
     def run(self, batch_size: int = None) -> Dict[str, Any]:
         """
         Run the image creation agent on processed articles.
@@ -665,12 +928,18 @@ PROMPT_3: [realistic photo description]"""
             return {'processed': 0, 'failed': 0, 'disabled': True}
         
         batch_size = batch_size or self.batch_size
-        start_time = datetime.utcnow()
+        start_time = time.perf_counter()
         
         logger.info(f"Starting image generation (batch size: {batch_size})")
         
-        # Fetch articles ready for image generation
-        articles = self.db.get_articles_for_image_generation(limit=batch_size)
+        # Claim articles ready for image generation (each is marked as
+        # generating images as it is taken, so no other run picks it up)
+        articles = []
+        for _ in range(batch_size):
+            article = self.db.claim_article_for_image_generation(projection=ARTICLE_FIELDS)
+            if article is None:
+                break
+            articles.append(article)
         
         if not articles:
             logger.info("No articles ready for image generation")
@@ -683,19 +952,25 @@ PROMPT_3: [realistic photo description]"""
         
         logger.info(f"Found {len(articles)} articles for image generation")
         
-        processed = 0
-        failed = 0
-        
-        for i, article in enumerate(articles, 1):
-            logger.info(f"[{i}/{len(articles)}] Generating images...")
-            
-            result = self.process_article(article)
-            if result:
-                processed += 1
-            else:
-                failed += 1
+        results = None
+        try:
+            results = run_coroutine(self._process_batch(articles))
+        finally:
+            self._flush_image_updates()
+            # Memoized images are only reused within a run
+            self._image_memo.clear()
+            if results is None:
+                # The batch was interrupted: hand back the claimed articles
+                # it did not finish, or nothing would ever pick them up again
+                released = self.db.release_articles_for_image_generation(
+                    [str(article['_id']) for article in articles]
+                )
+                if released:
+                    logger.warning(f"Released {released} unfinished articles back to curated")
+        processed = sum(1 for result in results if result)
+        failed = len(results) - processed
         
-        duration = (datetime.utcnow() - start_time).total_seconds()
+        duration = time.perf_counter() - start_time
         
         summary = {
             'processed': processed,
@@ -727,7 +1002,7 @@ PROMPT_3: [realistic photo description]"""
         logger.info("Checking for articles with incomplete images (max 3 retries)...")
         
         # Get articles that need image retry (already filtered by retry count in DB query)
-        incomplete_articles = self.db.get_articles_with_incomplete_images(limit=5)
+        incomplete_articles = self.db.get_articles_with_incomplete_images(limit=5, projection=ARTICLE_FIELDS)
         
         if not incomplete_articles:
             logger.info("No articles with incomplete images found (or all exceeded max retries)")
@@ -749,10 +1024,10 @@ PROMPT_3: [realistic photo description]"""
             
             # Reset article for retry (this increments the retry count)
             if self.db.mark_article_for_image_retry(article_id):
-                # Re-fetch the article and process
-                articles = self.db.get_articles_for_image_generation(limit=1)
-                if articles:
-                    result = self.process_article(articles[0])
+                # Claim the reset article and process it
+                article = self.db.claim_article_for_image_generation(article_id, projection=ARTICLE_FIELDS)
+                if article:
+                    result = self.process_article(article)
                     if result:
                         retried += 1
                         logger.info(f"Successfully retried images for: {title}")
@@ -763,9 +1038,10 @@ PROMPT_3: [realistic photo description]"""
     
     def close(self):
         """Clean up resources."""
-        if self.db:
-            self.db.disconnect()
-            logger.info("Image creation agent closed")
+        # The shared event loop, HTTP session, Groq client and MongoDB
+        # connection are closed at exit
+        self.db = None
+        logger.info("Image creation agent closed")
 
 
 # For running as a standalone script
@@ -3,18 +3,23 @@ Agent 2: Orchestrator & Scheduler Agent
 The brain of the operation - triggers 15-minute cycles, manages workflow, coordinates agents.
 """
 
+import asyncio
 import logging
 import signal
 import sys
-import yaml
-from datetime import datetime
+import time
+from datetime import datetime, timezone
 from typing import Dict, Any, Optional, Callable
-from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.events import EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED, JobEvent
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 
-# Add parent directory to path for imports
 import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Running as a script (python agents/<name>.py) puts agents/ rather than the
+# project root on sys.path; package imports need no adjustment
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from agents.scraper_agent import ScraperAgent
 from agents.content_curation_agent import ContentCurationAgent
@@ -22,6 +27,7 @@ from agents.image_creation_agent import ImageCreationAgent
 from agents.article_ranking_agent import ArticleRankingAgent
 from agents.telegram_bot_agent import TelegramBotAgent
 from database.mongodb import MongoDBManager
+from utils.config import load_config
 
 logger = logging.getLogger(__name__)
 
@@ -46,7 +52,11 @@ class OrchestratorAgent:
         """
         self.config = self._load_config(config_path)
         self.config_path = config_path
-        self.scheduler: Optional[BackgroundScheduler] = None
+        # Kept across runs so its database connection and caches are reused
+        self.scraper: Optional[ScraperAgent] = None
+        self.scheduler: Optional[AsyncIOScheduler] = None
+        # Event loop the scheduler runs on (created by start(), run by wait())
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         self.is_running = False
         self.pipeline_status = {
             "last_run": None,
@@ -67,12 +77,11 @@ class OrchestratorAgent:
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         """Load configuration from YAML file."""
         try:
-            with open(config_path, "r") as f:
-                config = yaml.safe_load(f)
+            config = load_config(config_path)
             logger.info("Orchestrator configuration loaded")
             return config
         except Exception as e:
-            logger.error(f"Failed to load config: {e}")
+            logger.error("Failed to load config: %s", e)
             raise
     
     def _run_scraper(self) -> Dict[str, Any]:
@@ -83,15 +92,15 @@ class OrchestratorAgent:
             newsapi_count = scraper_config.get("NEWSAPI_COUNT", 5)
             gnews_count = scraper_config.get("GNEWS_COUNT", 2)
             
-            agent = ScraperAgent(config_path=self.config_path)
-            result = agent.run(newsapi_count=newsapi_count, gnews_count=gnews_count)
-            agent.close()
+            if self.scraper is None:
+                self.scraper = ScraperAgent(config=self.config)
+            result = self.scraper.run(newsapi_count=newsapi_count, gnews_count=gnews_count)
             
-            logger.info(f"Pipeline Stage: SCRAPE - Complete. "
-                       f"Fetched {result['totalFetched']}, Stored {result['inserted']}")
+            logger.info("Pipeline Stage: SCRAPE - Complete. Fetched %s, Stored %s",
+                        result['totalFetched'], result['inserted'])
             return {"stage": "scrape", "success": True, "result": result}
         except Exception as e:
-            logger.error(f"Pipeline Stage: SCRAPE - Failed: {e}")
+            logger.error("Pipeline Stage: SCRAPE - Failed: %s", e)
             return {"stage": "scrape", "success": False, "error": str(e)}
     
     def _run_ranker(self) -> Dict[str, Any]:
@@ -106,11 +115,11 @@ class OrchestratorAgent:
                 logger.info("Pipeline Stage: RANK - Disabled in config, skipping")
                 return {"stage": "rank", "success": True, "result": result, "skipped": True}
             
-            logger.info(f"Pipeline Stage: RANK - Complete. "
-                       f"Selected {result['selected']}, Filtered {result['filtered']}")
+            logger.info("Pipeline Stage: RANK - Complete. Selected %s, Filtered %s",
+                        result['selected'], result['filtered'])
             return {"stage": "rank", "success": True, "result": result}
         except Exception as e:
-            logger.error(f"Pipeline Stage: RANK - Failed: {e}")
+            logger.error("Pipeline Stage: RANK - Failed: %s", e)
             return {"stage": "rank", "success": False, "error": str(e)}
     
     def _run_curator(self) -> Dict[str, Any]:
@@ -124,11 +133,11 @@ class OrchestratorAgent:
             result = agent.run(batch_size=batch_size)
             agent.close()
             
-            logger.info(f"Pipeline Stage: CURATE - Complete. "
-                       f"Processed {result['processed']}, Failed {result['failed']}")
+            logger.info("Pipeline Stage: CURATE - Complete. Processed %s, Failed %s",
+                        result['processed'], result['failed'])
             return {"stage": "curate", "success": True, "result": result}
         except Exception as e:
-            logger.error(f"Pipeline Stage: CURATE - Failed: {e}")
+            logger.error("Pipeline Stage: CURATE - Failed: %s", e)
             return {"stage": "curate", "success": False, "error": str(e)}
     
     def _run_image_generator(self) -> Dict[str, Any]:
@@ -148,11 +157,11 @@ class OrchestratorAgent:
             result = agent.run(batch_size=batch_size)
             agent.close()
             
-            logger.info(f"Pipeline Stage: GENERATE_IMAGE - Complete. "
-                       f"Processed {result['processed']}, Failed {result['failed']}")
+            logger.info("Pipeline Stage: GENERATE_IMAGE - Complete. Processed %s, Failed %s",
+                        result['processed'], result['failed'])
             return {"stage": "generate_image", "success": True, "result": result}
         except Exception as e:
-            logger.error(f"Pipeline Stage: GENERATE_IMAGE - Failed: {e}")
+            logger.error("Pipeline Stage: GENERATE_IMAGE - Failed: %s", e)
             return {"stage": "generate_image", "success": False, "error": str(e)}
     
     def _run_telegram_broadcaster(self) -> Dict[str, Any]:
@@ -170,11 +179,11 @@ class OrchestratorAgent:
             result = agent.run()
             agent.close()
             
-            logger.info(f"Pipeline Stage: TELEGRAM_BROADCAST - Complete. "
-                       f"Articles: {result['articles_broadcast']}, Sent: {result['total_sent']}")
+            logger.info("Pipeline Stage: TELEGRAM_BROADCAST - Complete. Articles: %s, Sent: %s",
+                        result['articles_broadcast'], result['total_sent'])
             return {"stage": "telegram_broadcast", "success": True, "result": result}
         except Exception as e:
-            logger.error(f"Pipeline Stage: TELEGRAM_BROADCAST - Failed: {e}")
+            logger.error("Pipeline Stage: TELEGRAM_BROADCAST - Failed: %s", e)
             return {"stage": "telegram_broadcast", "success": False, "error": str(e)}
     
     def run_pipeline(self) -> Dict[str, Any]:
@@ -185,10 +194,24 @@ class OrchestratorAgent:
         Returns:
             Dictionary with pipeline execution results
         """
-        start_time = datetime.utcnow()
+        return asyncio.run(self.run_pipeline_async())
+    
+    async def run_pipeline_async(self) -> Dict[str, Any]:
+        """
+        Execute the full news pipeline on the running event loop.
+        
+        The agents expose blocking APIs (some drive event loops of their
+        own), so each stage runs in a worker thread while the loop stays
+        free to serve the scheduler and signals.
+        
+        Returns:
+            Dictionary with pipeline execution results
+        """
+        start_time = datetime.now(timezone.utc)
+        started = time.perf_counter()
         logger.info("="*60)
         logger.info("PIPELINE EXECUTION STARTED")
-        logger.info(f"Time: {start_time.isoformat()}")
+        logger.info("Time: %s", start_time.isoformat())
         logger.info("="*60)
         
         results = {
@@ -200,20 +223,20 @@ class OrchestratorAgent:
         # Execute each active pipeline stage
         for stage_name, stage_handler in self.pipeline_stages.items():
             try:
-                stage_result = stage_handler()
+                stage_result = await asyncio.to_thread(stage_handler)
                 results["stages"][stage_name] = stage_result
                 
                 if not stage_result.get("success", False):
                     results["success"] = False
-                    logger.warning(f"Stage '{stage_name}' failed, continuing pipeline...")
+                    logger.warning("Stage '%s' failed, continuing pipeline...", stage_name)
             except Exception as e:
-                logger.error(f"Unexpected error in stage '{stage_name}': {e}")
+                logger.error("Unexpected error in stage '%s': %s", stage_name, e)
                 results["stages"][stage_name] = {"success": False, "error": str(e)}
                 results["success"] = False
         
         # Update pipeline status
-        end_time = datetime.utcnow()
-        duration = (end_time - start_time).total_seconds()
+        end_time = datetime.now(timezone.utc)
+        duration = time.perf_counter() - started
         results["end_time"] = end_time.isoformat()
         results["duration_seconds"] = duration
         
@@ -224,20 +247,32 @@ class OrchestratorAgent:
             self.pipeline_status["errors_count"] += 1
         
         logger.info("="*60)
-        logger.info(f"PIPELINE EXECUTION COMPLETE")
-        logger.info(f"Duration: {duration:.2f}s | Success: {results['success']}")
+        logger.info("PIPELINE EXECUTION COMPLETE")
+        logger.info("Duration: %.2fs | Success: %s", duration, results['success'])
         logger.info("="*60)
         
         return results
     
-    def _scheduled_pipeline_run(self):
+    async def _scheduled_pipeline_run(self):
         """Wrapper for scheduled pipeline execution with error handling."""
         try:
-            self.run_pipeline()
+            await self.run_pipeline_async()
+        except asyncio.CancelledError:
+            # Shutdown while a run was in progress; nothing left to report
+            logger.info("Scheduled pipeline run cancelled by shutdown")
         except Exception as e:
-            logger.error(f"Scheduled pipeline run failed: {e}")
+            logger.error("Scheduled pipeline run failed: %s", e)
             self.pipeline_status["errors_count"] += 1
     
+    def _on_run_skipped(self, event: JobEvent):
+        """Warn when a scheduled run is skipped because the previous one ran too long."""
+        if event.code == EVENT_JOB_MAX_INSTANCES:
+            logger.warning("Skipped a scheduled pipeline run: the previous run is still in progress. "
+                           "Consider a longer SCHEDULER.INTERVAL_MINUTES.")
+        else:
+            logger.warning("Missed scheduled pipeline run(s) due at %s; coalesced into the next run. "
+                           "Consider a longer SCHEDULER.INTERVAL_MINUTES.", event.scheduled_run_time)
+    
     def start(self, interval_minutes: int = None, run_immediately: bool = None):
         """
         Start the scheduler for periodic pipeline execution.
@@ -255,44 +290,62 @@ class OrchestratorAgent:
         interval = interval_minutes or scheduler_config.get("INTERVAL_MINUTES", 15)
         run_on_start = run_immediately if run_immediately is not None else scheduler_config.get("RUN_ON_START", True)
         
-        logger.info(f"Starting Orchestrator Scheduler")
-        logger.info(f"  Interval: {interval} minutes")
-        logger.info(f"  Run on start: {run_on_start}")
+        logger.info("Starting Orchestrator Scheduler")
+        logger.info("  Interval: %s minutes", interval)
+        logger.info("  Run on start: %s", run_on_start)
         
-        # Create and configure scheduler
-        self.scheduler = BackgroundScheduler()
+        # Create and configure scheduler; jobs run on self._loop once wait()
+        # starts it
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        self.scheduler = AsyncIOScheduler(event_loop=self._loop)
+        # A run that outlasts the interval must not overlap the next one:
+        # at most one instance, and runs missed meanwhile collapse into one.
+        # The initial run is the job's first run (rather than a direct call),
+        # so it is covered by the same guarantee
         self.scheduler.add_job(
             self._scheduled_pipeline_run,
             trigger=IntervalTrigger(minutes=interval),
             id="news_pipeline",
             name="News Pipeline",
-            replace_existing=True
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+            misfire_grace_time=60,
+            next_run_time=datetime.now(timezone.utc) if run_on_start else None
         )
+        self.scheduler.add_listener(self._on_run_skipped, EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES)
         
         # Start scheduler
         self.scheduler.start()
         self.is_running = True
         
         logger.info("Scheduler started successfully")
-        
-        # Run immediately if configured
         if run_on_start:
-            logger.info("Running initial pipeline...")
-            self.run_pipeline()
+            logger.info("Initial pipeline run will start with the event loop")
         
         # Calculate next run time
         job = self.scheduler.get_job("news_pipeline")
         if job and job.next_run_time:
-            logger.info(f"Next scheduled run: {job.next_run_time}")
+            logger.info("Next scheduled run: %s", job.next_run_time)
     
     def stop(self):
         """Stop the scheduler gracefully."""
         if self.scheduler and self.is_running:
             logger.info("Stopping scheduler...")
-            self.scheduler.shutdown(wait=True)
+            # Both are queued on the loop, so the shutdown runs before it stops
+            self.scheduler.shutdown(wait=False)
+            if self._loop.is_running():
+                self._loop.call_soon_threadsafe(self._loop.stop)
             self.is_running = False
             logger.info("Scheduler stopped")
     
+    def _close_scraper(self):
+        """Close the long-lived scraper (only once no pipeline stage is using it)."""
+        if self.scraper:
+            self.scraper.close()
+            self.scraper = None
+    
     def get_status(self) -> Dict[str, Any]:
         """Get current orchestrator status."""
         status = {
@@ -309,20 +362,51 @@ class OrchestratorAgent:
         return status
     
     def wait(self):
-        """Block until interrupted (for running as main process)."""
-        import time
+        """Run the scheduler's event loop until stopped or interrupted (for running as main process)."""
+        if self._loop is None:
+            return
+        
+        loop = self._loop
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, self._handle_signal, signum)
+            except (NotImplementedError, RuntimeError, ValueError):
+                # Windows, or not on the main thread: KeyboardInterrupt below
+                pass
+        
         try:
-            while self.is_running:
-                time.sleep(1)
+            if self.is_running:
+                loop.run_forever()
         except KeyboardInterrupt:
             logger.info("Received interrupt signal")
             self.stop()
+        finally:
+            # Let the queued scheduler shutdown run, and cancel a pipeline
+            # run still in progress; its current stage thread cannot be
+            # cancelled, so wait for it before closing the scraper it may use
+            loop.run_until_complete(self._cancel_pending_tasks())
+            loop.run_until_complete(loop.shutdown_default_executor())
+            loop.close()
+            self._close_scraper()
+    
+    @staticmethod
+    async def _cancel_pending_tasks():
+        """Cancel every other task on the running loop and wait for them to finish."""
+        pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    
+    def _handle_signal(self, signum: int):
+        """Stop the scheduler on SIGINT/SIGTERM received by the event loop."""
+        logger.info("Received signal %s, shutting down...", signum)
+        self.stop()
 
 
 def setup_signal_handlers(orchestrator: OrchestratorAgent):
     """Setup graceful shutdown handlers."""
     def signal_handler(signum, frame):
-        logger.info(f"Received signal {signum}, shutting down...")
+        logger.info("Received signal %s, shutting down...", signum)
         orchestrator.stop()
         sys.exit(0)
     
@@ -3,35 +3,83 @@ Agent 1: Scraper & Ingestion Agent
 Fetches news from NewsAPI and GNews, extracts full content, and stores in MongoDB.
 """
 
+import asyncio
 import logging
-import requests
-import yaml
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+import time
+import aiohttp
+from typing import List, Dict, Any, Optional, Set, Tuple
+from datetime import datetime, timezone
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 import sys
 import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Running as a script (python agents/<name>.py) puts agents/ rather than the
+# project root on sys.path; package imports need no adjustment
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents._clients import get_http_session, get_mongo, run_coroutine
 from database.mongodb import MongoDBManager
-from utils.helpers import extract_article_text, parse_datetime
+from utils import fastjson
+from utils.config import load_config
+from utils.helpers import fetch_article_text, parse_datetime
 
 logger = logging.getLogger(__name__)
 
+# API requests answered with these statuses are retried API_RETRIES times,
+# waiting API_BACKOFF, then twice that, ... seconds in between
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+API_RETRIES = 2
+API_BACKOFF = 0.3
+# A Retry-After longer than this (e.g. an exhausted daily quota) is not
+# waited out; the request fails instead
+API_MAX_RETRY_AFTER = 10
+
+# Requests in flight at once to each news API (other hosts use MAX_PER_HOST)
+API_HOST_LIMITS = {"newsapi.org": 4, "gnews.io": 2}
+
+# Pages whose content could not be extracted are not requested again for
+# this many seconds (they never reach the database, so nothing else
+# remembers them between runs)
+FAILED_URL_TTL = 3600
+
+# Seconds resolved hostnames stay cached in the (long-lived) connection pool
+DNS_CACHE_TTL = 300
+
+
+def _source_key(name: Optional[str]) -> str:
+    """Canonical form of a source name, used for the one-article-per-source checks."""
+    return (name or "").strip().lower()
+
+
+def _url_key(url: str) -> str:
+    """
+    Canonical form of an article URL, used to spot the same article listed twice.
+    
+    Lowercases the scheme and host and drops the fragment and utm_* tracking
+    parameters; other query parameters can identify the article and are kept.
+    """
+    parts = urlsplit(url.strip())
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if not k.lower().startswith("utm_")]
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, urlencode(query), ""))
+
 
 class ScraperAgent:
     """
     Scraper agent that fetches news from multiple sources and stores in MongoDB.
     """
     
-    def __init__(self, config_path: str = "config.yaml"):
+    def __init__(self, config_path: str = "config.yaml", config: Optional[Dict[str, Any]] = None):
         """
         Initialize the scraper agent with configuration.
         
         Args:
             config_path: Path to the YAML configuration file
+            config: Already-parsed configuration (config_path is then not read)
         """
-        self.config = self._load_config(config_path)
+        self.config = config if config is not None else self._load_config(config_path)
         self.db = self._init_database()
         
         # API configurations
@@ -39,85 +87,154 @@ class ScraperAgent:
         self.gnews_key = self.config["GOOGLE_NEWS"]["API_KEY"]
         self.user_agent = self.config["SCRAPER"]["USER_AGENT"]
         self.timeout = self.config["SCRAPER"]["REQUEST_TIMEOUT"]
+        # Article pages downloaded at once
+        self.max_concurrency = self.config["SCRAPER"].get("MAX_CONCURRENCY", 10)
+        # ... and from any single host
+        self.max_per_host = self.config["SCRAPER"].get("MAX_PER_HOST", 2)
+        self._page_semaphore: Optional[asyncio.Semaphore] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        # URL keys (see _url_key) of the articles selected so far this run
+        self._selected_urls: Set[str] = set()
+        # ISO timestamp of the current run, stamped on every article it fetches
+        self._run_started_at = ""
+        # API request key -> (validator headers, parsed body) of its last
+        # response, for conditional requests on the next run
+        self._api_cache: Dict[str, Tuple[Dict[str, str], Dict[str, Any]]] = {}
+        # URL -> time.monotonic() until which its extraction is not retried
+        self._failed_urls: Dict[str, float] = {}
         
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         """Load configuration from YAML file."""
         try:
-            with open(config_path, "r") as f:
-                config = yaml.safe_load(f)
+            config = load_config(config_path)
             logger.info("Configuration loaded successfully")
             return config
         except Exception as e:
-            logger.error(f"Failed to load config: {e}")
+            logger.error("Failed to load config: %s", e)
             raise
     
     def _init_database(self) -> MongoDBManager:
         """Initialize MongoDB connection."""
         mongo_config = self.config["MONGODB"]
-        db = MongoDBManager(
-            connection_url=mongo_config["CONNECTION_URL"],
-            database_name=mongo_config["DATABASE_NAME"],
-            collection_name=mongo_config["COLLECTION_NAME"]
+        return get_mongo(
+            mongo_config["CONNECTION_URL"],
+            mongo_config["DATABASE_NAME"],
+            mongo_config["COLLECTION_NAME"]
         )
-        if not db.connect():
-            raise ConnectionError("Failed to connect to MongoDB")
-        return db
     
-    def fetch_newsapi(self, source: str = "bbc-news") -> List[Dict[str, Any]]:
+    def _get_host_semaphore(self, host: str) -> asyncio.Semaphore:
+        """Return the semaphore limiting concurrent requests to a host (created on first use)."""
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            limit = API_HOST_LIMITS.get(host, self.max_per_host)
+            semaphore = self._host_semaphores[host] = asyncio.Semaphore(limit)
+        return semaphore
+    
+    async def _get_json(self, session: aiohttp.ClientSession, url: str,
+                        params: Dict[str, Any] = None, headers: Dict[str, str] = None) -> Dict[str, Any]:
+        """
+        GET a JSON API endpoint, retrying throttled and server-error responses.
+        
+        At most API_HOST_LIMITS requests are in flight per API host, and a
+        Retry-After header on a throttled response is honoured.
+        
+        Responses carrying an ETag or Last-Modified header are remembered,
+        and the next identical request is made conditional: a 304 reply
+        returns the remembered body without downloading or parsing it again.
+        
+        Raises:
+            aiohttp.ClientResponseError: On an HTTP error status
+            aiohttp.ClientError: On connection errors
+            asyncio.TimeoutError: If the request takes longer than REQUEST_TIMEOUT
+            ValueError: If the body is not valid JSON
+        """
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        cache_key = f"{url}?{urlencode(sorted((params or {}).items()))}"
+        cached = self._api_cache.get(cache_key)
+        if cached:
+            headers = {**(headers or {}), **cached[0]}
+        
+        async with self._get_host_semaphore(urlsplit(url).hostname or ""):
+            for attempt in range(API_RETRIES + 1):
+                async with session.get(url, params=params, headers=headers, timeout=timeout) as response:
+                    if response.status in RETRY_STATUSES and attempt < API_RETRIES:
+                        delay = API_BACKOFF * 2 ** attempt
+                        retry_after = response.headers.get("Retry-After", "")
+                        if retry_after.isdigit():
+                            if int(retry_after) > API_MAX_RETRY_AFTER:
+                                response.raise_for_status()
+                            delay = max(delay, int(retry_after))
+                        logger.warning("HTTP %s from %s, retrying in %.1fs", response.status, url, delay)
+                        await asyncio.sleep(delay)
+                        continue
+                    if response.status == 304 and cached:
+                        logger.debug("%s not modified, reusing previous response", url)
+                        return cached[1]
+                    response.raise_for_status()
+                    data = fastjson.loads(await response.read())
+                    
+                    validators = {}
+                    if "ETag" in response.headers:
+                        validators["If-None-Match"] = response.headers["ETag"]
+                    if "Last-Modified" in response.headers:
+                        validators["If-Modified-Since"] = response.headers["Last-Modified"]
+                    if validators:
+                        self._api_cache[cache_key] = (validators, data)
+                    else:
+                        self._api_cache.pop(cache_key, None)
+                    return data
+    
+    async def fetch_newsapi(self, session: aiohttp.ClientSession, source: str = "bbc-news") -> List[Dict[str, Any]]:
         """
         Fetch articles from NewsAPI by source.
         
         Args:
+            session: aiohttp session to issue the request on
             source: News source identifier (default: bbc-news)
             
         Returns:
-            List of article dictionaries
+            List of raw article dictionaries from the API (content not yet extracted)
         """
-        articles = []
-        url = f"https://newsapi.org/v2/top-headlines?sources={source}&language=en"
+        url = "https://newsapi.org/v2/top-headlines"
+        params = {"sources": source, "language": "en"}
         headers = {"Authorization": f"Bearer {self.newsapi_key}"}
         
         try:
-            logger.info(f"Fetching articles from NewsAPI (source: {source})")
-            response = requests.get(url, headers=headers, timeout=self.timeout)
-            response.raise_for_status()
-            data = response.json()
+            logger.info("Fetching articles from NewsAPI (source: %s)", source)
+            data = await self._get_json(session, url, params=params, headers=headers)
             
             if data.get("status") != "ok":
-                logger.error(f"NewsAPI error: {data.get('message', 'Unknown error')}")
-                return articles
+                logger.error("NewsAPI error: %s", data.get('message', 'Unknown error'))
+                return []
             
-            for item in data.get("articles", []):
-                article = self._process_article(item, "NewsAPI")
-                if article:
-                    articles.append(article)
-            
-            logger.info(f"Fetched {len(articles)} articles from NewsAPI")
+            articles = data.get("articles", [])
+            logger.info("Fetched %d articles from NewsAPI", len(articles))
             return articles
             
-        except requests.exceptions.HTTPError as e:
-            logger.error(f"NewsAPI HTTP error: {e}")
-            return articles
-        except requests.exceptions.RequestException as e:
-            logger.error(f"NewsAPI request error: {e}")
-            return articles
+        except aiohttp.ClientResponseError as e:
+            logger.error("NewsAPI HTTP error: %s", e)
+            return []
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error("NewsAPI request error: %r", e)
+            return []
         except Exception as e:
-            logger.error(f"Unexpected error fetching from NewsAPI: {e}")
-            return articles
+            logger.error("Unexpected error fetching from NewsAPI: %s", e)
+            return []
     
-    def fetch_trending_newsapi(self, category: str = "technology") -> List[Dict[str, Any]]:
+    async def fetch_trending_newsapi(self, session: aiohttp.ClientSession,
+                                     category: str = "technology") -> List[Dict[str, Any]]:
         """
         Fetch trending/latest articles from NewsAPI by category.
         This gets the most current top headlines across all sources.
         
         Args:
+            session: aiohttp session to issue the request on
             category: News category (business, entertainment, general, health, 
                      science, sports, technology)
             
         Returns:
-            List of article dictionaries
+            List of raw article dictionaries from the API (content not yet extracted)
         """
-        articles = []
         url = "https://newsapi.org/v2/top-headlines"
         params = {
             "category": category,
@@ -128,45 +245,40 @@ class ScraperAgent:
         headers = {"Authorization": f"Bearer {self.newsapi_key}"}
         
         try:
-            logger.info(f"Fetching trending articles from NewsAPI (category: {category})")
-            response = requests.get(url, params=params, headers=headers, timeout=self.timeout)
-            response.raise_for_status()
-            data = response.json()
+            logger.info("Fetching trending articles from NewsAPI (category: %s)", category)
+            data = await self._get_json(session, url, params=params, headers=headers)
             
             if data.get("status") != "ok":
-                logger.error(f"NewsAPI error: {data.get('message', 'Unknown error')}")
-                return articles
+                logger.error("NewsAPI error: %s", data.get('message', 'Unknown error'))
+                return []
             
-            for item in data.get("articles", []):
-                article = self._process_article(item, "NewsAPI")
-                if article:
-                    articles.append(article)
-            
-            logger.info(f"Fetched {len(articles)} trending articles from NewsAPI ({category})")
+            articles = data.get("articles", [])
+            logger.info("Fetched %d trending articles from NewsAPI (%s)", len(articles), category)
             return articles
             
-        except requests.exceptions.HTTPError as e:
-            logger.error(f"NewsAPI HTTP error: {e}")
-            return articles
-        except requests.exceptions.RequestException as e:
-            logger.error(f"NewsAPI request error: {e}")
-            return articles
+        except aiohttp.ClientResponseError as e:
+            logger.error("NewsAPI HTTP error: %s", e)
+            return []
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error("NewsAPI request error: %r", e)
+            return []
         except Exception as e:
-            logger.error(f"Unexpected error fetching trending from NewsAPI: {e}")
-            return articles
+            logger.error("Unexpected error fetching trending from NewsAPI: %s", e)
+            return []
     
-    def fetch_gnews(self, category: str = "general", max_articles: int = 10) -> List[Dict[str, Any]]:
+    async def fetch_gnews(self, session: aiohttp.ClientSession, category: str = "general",
+                          max_articles: int = 10) -> List[Dict[str, Any]]:
         """
         Fetch articles from GNews.
         
         Args:
+            session: aiohttp session to issue the request on
             category: News category (default: general)
             max_articles: Maximum number of articles (free tier: 10)
             
         Returns:
-            List of article dictionaries
+            List of raw article dictionaries from the API (content not yet extracted)
         """
-        articles = []
         url = "https://gnews.io/api/v4/top-headlines"
         params = {
             "category": category,
@@ -176,34 +288,30 @@ class ScraperAgent:
         }
         
         try:
-            logger.info(f"Fetching articles from GNews (category: {category})")
-            response = requests.get(url, params=params, timeout=self.timeout)
-            response.raise_for_status()
-            data = response.json()
+            logger.info("Fetching articles from GNews (category: %s)", category)
+            data = await self._get_json(session, url, params=params)
             
-            for item in data.get("articles", []):
-                article = self._process_article(item, "GNews")
-                if article:
-                    articles.append(article)
-            
-            logger.info(f"Fetched {len(articles)} articles from GNews")
+            articles = data.get("articles", [])
+            logger.info("Fetched %d articles from GNews", len(articles))
             return articles
             
-        except requests.exceptions.HTTPError as e:
-            logger.error(f"GNews HTTP error: {e}")
-            return articles
-        except requests.exceptions.RequestException as e:
-            logger.error(f"GNews request error: {e}")
-            return articles
+        except aiohttp.ClientResponseError as e:
+            logger.error("GNews HTTP error: %s", e)
+            return []
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error("GNews request error: %r", e)
+            return []
         except Exception as e:
-            logger.error(f"Unexpected error fetching from GNews: {e}")
-            return articles
+            logger.error("Unexpected error fetching from GNews: %s", e)
+            return []
     
-    def _process_article(self, raw_article: Dict[str, Any], api_source: str) -> Optional[Dict[str, Any]]:
+    async def _process_article(self, session: aiohttp.ClientSession, raw_article: Dict[str, Any],
+                               api_source: str) -> Optional[Dict[str, Any]]:
         """
         Process a raw article from an API, extracting full content.
         
         Args:
+            session: aiohttp session to download the article page on
             raw_article: Raw article data from API
             api_source: Name of the API source
             
@@ -214,10 +322,16 @@ class ScraperAgent:
         if not url:
             return None
         
+        if self._failed_urls.get(url, 0) > time.monotonic():
+            logger.debug("Skipping recently failed URL: %s", url)
+            return None
+        
         # Extract full article content
-        content = extract_article_text(url, self.user_agent, self.timeout)
+        async with self._get_host_semaphore(urlsplit(url).hostname or ""), self._page_semaphore:
+            content = await fetch_article_text(session, url, self.user_agent, self.timeout)
         if not content:
-            logger.debug(f"Could not extract content from: {url}")
+            logger.debug("Could not extract content from: %s", url)
+            self._failed_urls[url] = time.monotonic() + FAILED_URL_TTL
             return None
         
         # Build article object
@@ -230,7 +344,7 @@ class ScraperAgent:
             "imageUrl": raw_article.get("urlToImage") or raw_article.get("image", ""),
             "publishedAt": raw_article.get("publishedAt", ""),
             "content": content,
-            "fetchedAt": datetime.utcnow().isoformat()
+            "fetchedAt": self._run_started_at
         }
         
         return article
@@ -250,18 +364,143 @@ class ScraperAgent:
         diverse_articles = []
         
         for article in articles:
-            source = article.get("source", "").lower()
+            source = _source_key(article.get("source"))
             if source and source not in seen_sources:
                 seen_sources.add(source)
                 diverse_articles.append(article)
-                logger.debug(f"Selected article from source: {article.get('source')}")
+                logger.debug("Selected article from source: %s", article.get('source'))
                 
                 if len(diverse_articles) >= max_count:
                     break
         
-        logger.info(f"Selected {len(diverse_articles)} articles from {len(seen_sources)} unique sources")
+        logger.info("Selected %d articles from %d unique sources", len(diverse_articles), len(seen_sources))
         return diverse_articles
     
+    async def _select_articles(self, session: aiohttp.ClientSession, candidates: List[Tuple[str, Dict[str, Any]]],
+                               api_source: str, count: int, seen_sources: Set[str]) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Pick up to `count` articles from sources not seen yet, extracting their content.
+        
+        Sources are considered in listing order. Each source's articles are
+        tried one at a time until one yields content, and only as many
+        sources are tried concurrently as articles are still needed, so
+        pages are downloaded for the chosen articles rather than for every
+        listed one. Articles whose URL is already stored, or that were
+        already selected this run (possibly under another source name), are
+        skipped before any download.
+        
+        Args:
+            session: aiohttp session to download article pages on
+            candidates: (tag, raw API article) pairs in order of preference
+            api_source: Name of the API source
+            count: Number of articles wanted
+            seen_sources: Source keys (see _source_key) already used (updated in place)
+            
+        Returns:
+            (tag, processed article) pairs, in listing order of their sources
+        """
+        existing_urls = await asyncio.to_thread(
+            self.db.get_existing_urls, {raw["url"] for _, raw in candidates if raw.get("url")}
+        )
+        
+        by_source: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+        listed_urls = set(self._selected_urls)
+        for tag, raw in candidates:
+            url = raw.get("url")
+            if not url or url in existing_urls:
+                continue
+            url_key = _url_key(url)
+            if url_key in listed_urls:
+                continue
+            source_name = _source_key(raw.get("source", {}).get("name", "Unknown"))
+            if source_name and source_name not in seen_sources:
+                listed_urls.add(url_key)
+                by_source.setdefault(source_name, []).append((tag, raw))
+        sources = list(by_source)
+        
+        async def first_with_content(source_name: str) -> Tuple[str, Optional[Tuple[str, Dict[str, Any]]]]:
+            for tag, raw in by_source[source_name]:
+                article = await self._process_article(session, raw, api_source)
+                if article:
+                    return source_name, (tag, article)
+            logger.debug("No extractable article from source: %s", source_name)
+            return source_name, None
+        
+        chosen: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        pending = set()
+        next_source = 0
+        while True:
+            while next_source < len(sources) and len(chosen) + len(pending) < count:
+                pending.add(asyncio.ensure_future(first_with_content(sources[next_source])))
+                next_source += 1
+            if not pending:
+                break
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                source_name, result = task.result()
+                if result:
+                    chosen[source_name] = result
+        
+        seen_sources.update(chosen)
+        self._selected_urls.update(_url_key(article["url"]) for _, article in chosen.values())
+        return [chosen[source_name] for source_name in sources if source_name in chosen]
+    
+    async def _select_fallback_articles(self, session: aiohttp.ClientSession, sources: List[str], count: int,
+                                        seen_sources: Set[str], summary: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Pick up to `count` articles, one per NewsAPI source, from whichever sources answer first.
+        
+        All source listings are requested at once. Each listing is handed
+        to _select_articles as soon as it arrives (while articles are still
+        needed), and the requests still outstanding are cancelled once
+        enough articles have been chosen.
+        
+        Args:
+            session: aiohttp session to issue requests on
+            sources: NewsAPI source identifiers to try
+            count: Number of articles wanted
+            seen_sources: Source keys (see _source_key) already used (updated in place)
+            summary: Run summary (failed sources are recorded in it)
+            
+        Returns:
+            (tag, processed article) pairs, in the order they were chosen
+        """
+        fetches = {asyncio.ensure_future(self.fetch_newsapi(session, source)): source for source in sources}
+        selections = set()
+        waiting: List[List[Tuple[str, Dict[str, Any]]]] = []
+        chosen: List[Tuple[str, Dict[str, Any]]] = []
+        
+        try:
+            while len(chosen) < count and (fetches or selections or waiting):
+                # Hand arrived listings to _select_articles while more articles are needed
+                while waiting and len(chosen) + len(selections) < count:
+                    selections.add(asyncio.ensure_future(
+                        self._select_articles(session, waiting.pop(0), "NewsAPI", 1, seen_sources)
+                    ))
+                if not fetches and not selections:
+                    break
+                
+                done, _ = await asyncio.wait(set(fetches) | selections, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task in fetches:
+                        source = fetches.pop(task)
+                        try:
+                            articles = task.result()
+                        except Exception as e:
+                            logger.error("Error fetching from NewsAPI (%s): %s", source, e)
+                            summary["sources"][f"newsapi_{source}"] = 0
+                            continue
+                        if articles:
+                            waiting.append([(f"newsapi_{source}", item) for item in articles])
+                    else:
+                        selections.discard(task)
+                        chosen.extend(task.result())
+        finally:
+            for task in list(fetches) + list(selections):
+                task.cancel()
+        
+        return chosen[:count]
+    
     def run(self, newsapi_count: int = 5, gnews_count: int = 2, use_trending: bool = True) -> Dict[str, Any]:
         """
         Run the scraper agent - fetch trending news from diverse sources.
@@ -274,10 +513,21 @@ class ScraperAgent:
         Returns:
             Summary of the scraping operation
         """
+        return run_coroutine(self._run_async(newsapi_count, gnews_count, use_trending))
+    
+    async def _run_async(self, newsapi_count: int, gnews_count: int, use_trending: bool) -> Dict[str, Any]:
+        """
+        Fetch, select and store articles (see run()).
+        
+        All API listings are requested concurrently, then the article pages
+        of the selected candidates are downloaded concurrently, at most
+        MAX_CONCURRENCY at a time and MAX_PER_HOST from any one site.
+        """
+        self._run_started_at = datetime.now(timezone.utc).isoformat()
         newsapi_articles = []
         gnews_articles = []
         summary = {
-            "startTime": datetime.utcnow().isoformat(),
+            "startTime": self._run_started_at,
             "sources": {},
             "totalFetched": 0,
             "uniqueSelected": 0,
@@ -287,29 +537,44 @@ class ScraperAgent:
         }
         
         seen_sources = set()
+        now = time.monotonic()
+        self._failed_urls = {url: until for url, until in self._failed_urls.items() if until > now}
+        # Created here so it binds to the running loop
+        self._page_semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._host_semaphores = {}
+        self._selected_urls = set()
+        
+        # Pooled connections (and their TLS sessions) are kept across runs
+        session = await get_http_session("scraper", limit=self.max_concurrency + 20,
+                                         dns_cache_ttl=DNS_CACHE_TTL)
+        
+        # GNews is listed alongside the NewsAPI trending categories, but
+        # selected from last so it only adds sources NewsAPI did not
+        trending_categories = ["technology", "business", "science", "general"] if use_trending else []
+        listings = await asyncio.gather(
+            self.fetch_gnews(session, max_articles=10),
+            *(self.fetch_trending_newsapi(session, category) for category in trending_categories),
+            return_exceptions=True
+        )
+        all_gnews, trending = listings[0], listings[1:]
         
         # Strategy 1: Fetch trending news by category (more current/latest)
         if use_trending:
-            trending_categories = ["technology", "business", "science", "general"]
+            candidates = []
+            for category, articles in zip(trending_categories, trending):
+                if isinstance(articles, BaseException):
+                    logger.error("Error fetching trending from NewsAPI (%s): %s", category, articles)
+                    continue
+                candidates.extend((f"newsapi_{category}", item) for item in articles)
             
-            for category in trending_categories:
-                if len(newsapi_articles) >= newsapi_count:
-                    break
-                try:
-                    articles = self.fetch_trending_newsapi(category)
-                    for article in articles:
-                        if len(newsapi_articles) >= newsapi_count:
-                            break
-                        source_name = article.get("source", "").lower()
-                        if source_name and source_name not in seen_sources:
-                            seen_sources.add(source_name)
-                            newsapi_articles.append(article)
-                            summary["sources"][f"newsapi_{category}"] = summary["sources"].get(f"newsapi_{category}", 0) + 1
-                            logger.info(f"Added trending article from {article.get('source')}")
-                except Exception as e:
-                    logger.error(f"Error fetching trending from NewsAPI ({category}): {e}")
+            for tag, article in await self._select_articles(
+                session, candidates, "NewsAPI", newsapi_count, seen_sources
+            ):
+                newsapi_articles.append(article)
+                summary["sources"][tag] = summary["sources"].get(tag, 0) + 1
+                logger.info("Added trending article from %s", article.get('source'))
             
-            logger.info(f"NewsAPI trending: Got {len(newsapi_articles)} articles from {len(seen_sources)} unique sources")
+            logger.info("NewsAPI trending: Got %d articles from %d unique sources", len(newsapi_articles), len(seen_sources))
         
         # Strategy 2: Fallback to source-based fetching if needed
         if len(newsapi_articles) < newsapi_count:
@@ -318,68 +583,54 @@ class ScraperAgent:
                 "techcrunch", "abc-news", "associated-press", "bloomberg"
             ]
             
-            for source in newsapi_sources:
-                if len(newsapi_articles) >= newsapi_count:
-                    break
-                try:
-                    articles = self.fetch_newsapi(source)
-                    if articles:
-                        article = articles[0]
-                        source_name = article.get("source", "").lower()
-                        if source_name not in seen_sources:
-                            seen_sources.add(source_name)
-                            newsapi_articles.append(article)
-                            summary["sources"][f"newsapi_{source}"] = 1
-                            logger.info(f"Added 1 article from NewsAPI: {article.get('source')}")
-                except Exception as e:
-                    logger.error(f"Error fetching from NewsAPI ({source}): {e}")
-                    summary["sources"][f"newsapi_{source}"] = 0
+            # One article per fallback source
+            for tag, article in await self._select_fallback_articles(
+                session, newsapi_sources, newsapi_count - len(newsapi_articles), seen_sources, summary
+            ):
+                newsapi_articles.append(article)
+                summary["sources"][tag] = 1
+                logger.info("Added 1 article from NewsAPI: %s", article.get('source'))
             
-            logger.info(f"NewsAPI: Got {len(newsapi_articles)} articles from {len(seen_sources)} unique sources")
+            logger.info("NewsAPI: Got %d articles from %d unique sources", len(newsapi_articles), len(seen_sources))
         
-        # Fetch from GNews (2 articles from different sources)
-        try:
-            all_gnews = self.fetch_gnews(max_articles=10)
+        # Select GNews articles (2 from different sources) from sources we haven't used yet
+        if isinstance(all_gnews, BaseException):
+            logger.error("Error fetching from GNews: %s", all_gnews)
+            summary["sources"]["gnews"] = 0
+        else:
             summary["sources"]["gnews_fetched"] = len(all_gnews)
-            
-            # Select articles from sources we haven't used yet
-            for article in all_gnews:
-                if len(gnews_articles) >= gnews_count:
-                    break
-                source_name = article.get("source", "").lower()
-                if source_name and source_name not in seen_sources:
-                    seen_sources.add(source_name)
-                    gnews_articles.append(article)
-                    logger.info(f"Added 1 article from GNews: {article.get('source')}")
+            for _, article in await self._select_articles(
+                session, [("gnews", item) for item in all_gnews], "GNews", gnews_count, seen_sources
+            ):
+                gnews_articles.append(article)
+                logger.info("Added 1 article from GNews: %s", article.get('source'))
             
             summary["sources"]["gnews_selected"] = len(gnews_articles)
-            logger.info(f"GNews: Selected {len(gnews_articles)} articles")
-        except Exception as e:
-            logger.error(f"Error fetching from GNews: {e}")
-            summary["sources"]["gnews"] = 0
-        
+            logger.info("GNews: Selected %d articles", len(gnews_articles))
+    
         # Combine all articles
         all_articles = newsapi_articles + gnews_articles
         summary["totalFetched"] = len(all_articles)
         summary["uniqueSelected"] = len(all_articles)
         
         # Log selected sources
-        if all_articles:
+        if all_articles and logger.isEnabledFor(logging.INFO):
             sources = [a.get("source") for a in all_articles]
-            logger.info(f"Final selected sources ({len(sources)}): {sources}")
+            logger.info("Final selected sources (%d): %s", len(sources), sources)
         
         # Store in database
         if all_articles:
-            results = self.db.insert_articles(all_articles)
+            results = await asyncio.to_thread(self.db.insert_articles, all_articles)
             summary["inserted"] = results["inserted"]
             summary["duplicates"] = results["duplicates"]
             summary["errors"] = results["errors"]
         
-        summary["endTime"] = datetime.utcnow().isoformat()
+        summary["endTime"] = datetime.now(timezone.utc).isoformat()
         
         # Log summary
-        logger.info(f"Scraper run complete: {len(newsapi_articles)} from NewsAPI + {len(gnews_articles)} from GNews = "
-                   f"{summary['totalFetched']} total, {summary['inserted']} new, {summary['duplicates']} duplicates")
+        logger.info("Scraper run complete: %d from NewsAPI + %d from GNews = %s total, %s new, %s duplicates",
+                    len(newsapi_articles), len(gnews_articles),
+                    summary['totalFetched'], summary['inserted'], summary['duplicates'])
         
         return summary
     
@@ -389,8 +640,9 @@ class ScraperAgent:
     
     def close(self):
         """Clean up resources."""
-        if self.db:
-            self.db.disconnect()
+        # The MongoDB connection is shared process-wide (see agents._clients)
+        # and is closed at exit
+        self.db = None
 
 
 # For running as a standalone script
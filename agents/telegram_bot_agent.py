@@ -11,22 +11,156 @@ Features:
 
 import logging
 import asyncio
-import yaml
-from typing import Dict, List, Any, Optional
-from datetime import datetime
+import hashlib
+import time
+from typing import Dict, List, Any, Optional, Set, Tuple
+from datetime import timedelta
 
-from telegram import Update, Bot
+from telegram import Update, Bot, Message, MessageEntity
 from telegram.ext import Application, CommandHandler, ContextTypes
 from telegram.constants import ParseMode
+from telegram.error import BadRequest, NetworkError, RetryAfter
+from telegram.request import HTTPXRequest
 
 import sys
 import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Running as a script (python agents/<name>.py) puts agents/ rather than the
+# project root on sys.path; package imports need no adjustment
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents._clients import get_mongo, run_coroutine
 from database.mongodb import MongoDBManager
+from utils import fastjson
+from utils.config import load_config
+from utils.rate_limiter import AsyncTokenBucket
 
 logger = logging.getLogger(__name__)
 
+# Telegram's broadcast limits, in messages per second: across all chats,
+# per private chat, and per group or channel (20 a minute)
+GLOBAL_RATE = 30
+CHAT_RATE = 1
+CHANNEL_RATE = 20 / 60
+
+# Times a message rejected by flood control (RetryAfter) or hit by a network
+# error is retried; network errors back off SEND_BACKOFF * 2**attempt seconds
+SEND_RETRIES = 2
+SEND_BACKOFF = 0.25
+
+# Articles broadcast at once (each still obeys the rate limits above)
+ARTICLE_CONCURRENCY = 3
+
+# Articles read from the database per round trip, and broadcast and marked
+# per batch
+BROADCAST_BATCH_SIZE = 50
+
+# Article fields broadcast_article reads
+BROADCAST_FIELDS = {
+    'title': 1,
+    'platforms.telegram': 1,
+    'platforms.website.title': 1,
+    'images.telegram.url': 1,
+    'images.telegram.file_id': 1,
+}
+
+# Simultaneous webhook requests Telegram may open to the bot (webhook mode)
+WEBHOOK_MAX_CONNECTIONS = 40
+
+# Seconds the subscriber list is reused across broadcasts before re-reading it
+SUBSCRIBERS_CACHE_TTL = 60
+
+# Command replies (Markdown): /start for a new and an existing subscriber,
+# /stop for a subscriber and a non-subscriber, and /status either way
+WELCOME_MESSAGE = (
+    "🎉 *Welcome to LLM News!*\n\n"
+    "You're now subscribed to receive the latest AI and tech news "
+    "delivered straight to your Telegram.\n\n"
+    "📰 You'll receive updates whenever new articles are published.\n\n"
+    "Commands:\n"
+    "• /stop - Unsubscribe from updates\n"
+    "• /status - Check your subscription status"
+)
+
+ALREADY_SUBSCRIBED_MESSAGE = (
+    "👋 *You're already subscribed!*\n\n"
+    "You'll continue receiving news updates.\n\n"
+    "Commands:\n"
+    "• /stop - Unsubscribe from updates\n"
+    "• /status - Check your subscription status"
+)
+
+UNSUBSCRIBED_MESSAGE = (
+    "👋 *You've been unsubscribed*\n\n"
+    "You won't receive any more news updates.\n\n"
+    "Want to come back? Just send /start anytime!"
+)
+
+NOT_SUBSCRIBED_MESSAGE = (
+    "🤔 *You weren't subscribed*\n\n"
+    "Want to subscribe? Send /start to get news updates!"
+)
+
+STATUS_SUBSCRIBED_MESSAGE = (
+    "✅ *You're subscribed!*\n\n"
+    "You'll receive news updates as they're published."
+)
+
+STATUS_NOT_SUBSCRIBED_MESSAGE = (
+    "❌ *You're not subscribed*\n\n"
+    "Send /start to subscribe and receive news updates!"
+)
+
+
+class _FastJSONRequest(HTTPXRequest):
+    """HTTPXRequest that parses Telegram's responses with utils.fastjson."""
+    
+    @staticmethod
+    def parse_json_payload(payload: bytes) -> Dict[str, Any]:
+        """Parse a Telegram response (payloads orjson rejects use the stdlib path)."""
+        try:
+            return fastjson.loads(payload)
+        except ValueError:
+            # Invalid UTF-8 or JSON: the base class decodes leniently and
+            # raises TelegramError if the payload is still unreadable
+            return HTTPXRequest.parse_json_payload(payload)
+
+
+def _utf16_len(text: str) -> int:
+    """Return the length of text in UTF-16 code units (Telegram's entity unit)."""
+    return len(text.encode('utf-16-le')) // 2
+
+
+def _build_message(title: str, teaser: str, article_link: str) -> Tuple[str, List[MessageEntity]]:
+    """
+    Render an article message as plain text plus formatting entities.
+    
+    The bold title and the link are given as entities, so neither the title
+    nor the teaser needs Markdown escaping and Telegram has no markup to parse.
+    
+    Args:
+        title: Article title (shown in bold)
+        teaser: Telegram teaser text
+        article_link: URL behind the "Read more" link
+        
+    Returns:
+        Tuple of (message text, entities)
+    """
+    head = "📰 "
+    middle = f"\n\n{teaser}\n\n🔗 "
+    link_text = "Read more"
+    
+    title_offset = _utf16_len(head)
+    title_length = _utf16_len(title)
+    link_offset = title_offset + title_length + _utf16_len(middle)
+    entities = [
+        MessageEntity(type=MessageEntity.BOLD, offset=title_offset, length=title_length),
+        MessageEntity(type=MessageEntity.TEXT_LINK, offset=link_offset,
+                      length=_utf16_len(link_text), url=article_link),
+    ]
+    return f"{head}{title}{middle}{link_text}", entities
+
 
 class TelegramBotAgent:
     """
@@ -46,7 +180,6 @@ class TelegramBotAgent:
             config_path: Path to YAML configuration file
         """
         self.config = self._load_config(config_path)
-        self.db = self._init_database()
         
         # Telegram config
         telegram_config = self.config.get('TELEGRAM', {})
@@ -54,23 +187,37 @@ class TelegramBotAgent:
         self.enabled = telegram_config.get('ENABLED', False)
         self.website_url = telegram_config.get('WEBSITE_URL', 'https://llm-news-nu.vercel.app')
         self.channel_id = telegram_config.get('CHANNEL_ID', '')  # Channel to post to
+        # Messages in flight at once when broadcasting to subscribers
+        self.max_concurrency = telegram_config.get('MAX_CONCURRENCY', 10)
+        # Public HTTPS base URL for webhook mode (empty = long polling)
+        self.webhook_url = telegram_config.get('WEBHOOK_URL', '')
+        self.webhook_port = telegram_config.get('WEBHOOK_PORT', 8443)
         
         if not self.bot_token or self.bot_token == 'your_bot_token_here':
             logger.warning("Telegram bot token not configured")
             self.enabled = False
         
+        # A disabled agent never touches the database, so skip connecting
+        self.db: Optional[MongoDBManager] = self._init_database() if self.enabled else None
+        
         # Log channel mode if configured
         if self.channel_id:
             logger.info(f"Channel mode enabled: posting to {self.channel_id}")
         
-        self.bot = None
+        # Created on first broadcast and reused for every message after it,
+        # so they share one HTTP connection pool
+        self.bot: Optional[Bot] = None
+        self._bot_request: Optional[_FastJSONRequest] = None
+        self._global_limiter = AsyncTokenBucket(rate=GLOBAL_RATE, capacity=1)
+        self._chat_limiters: Dict[Any, AsyncTokenBucket] = {}
+        # (time.monotonic() when read, subscribers, their chat ids)
+        self._subscribers_cache: Optional[Tuple[float, List[Dict], Set[Any]]] = None
         self.application = None
         
     def _load_config(self, config_path: str) -> Dict:
         """Load configuration from YAML file."""
         try:
-            with open(config_path, 'r') as f:
-                return yaml.safe_load(f)
+            return load_config(config_path)
         except Exception as e:
             logger.error(f"Failed to load config: {e}")
             raise
@@ -78,14 +225,11 @@ class TelegramBotAgent:
     def _init_database(self) -> MongoDBManager:
         """Initialize MongoDB connection."""
         mongo_config = self.config['MONGODB']
-        db = MongoDBManager(
-            connection_url=mongo_config['CONNECTION_URL'],
-            database_name=mongo_config['DATABASE_NAME'],
-            collection_name=mongo_config['COLLECTION_NAME']
+        return get_mongo(
+            mongo_config['CONNECTION_URL'],
+            mongo_config['DATABASE_NAME'],
+            mongo_config['COLLECTION_NAME']
         )
-        if not db.connect():
-            raise ConnectionError("Failed to connect to MongoDB")
-        return db
     
     # ==================== Command Handlers ====================
     
@@ -96,28 +240,14 @@ class TelegramBotAgent:
         
         logger.info(f"New subscription request from {username} (chat_id: {chat_id})")
         
-        # Add subscriber to database
-        success = self.db.add_telegram_subscriber(chat_id, username)
-        
+        # Add subscriber to database (in a worker thread, off the event loop)
+        success = await asyncio.to_thread(self.db.add_telegram_subscriber, chat_id, username)
         if success:
-            welcome_message = (
-                "🎉 *Welcome to LLM News!*\n\n"
-                "You're now subscribed to receive the latest AI and tech news "
-                "delivered straight to your Telegram.\n\n"
-                "📰 You'll receive updates whenever new articles are published.\n\n"
-                "Commands:\n"
-                "• /stop - Unsubscribe from updates\n"
-                "• /status - Check your subscription status"
-            )
+            self._subscribers_cache = None
+            welcome_message = WELCOME_MESSAGE
         else:
             # Already subscribed
-            welcome_message = (
-                "👋 *You're already subscribed!*\n\n"
-                "You'll continue receiving news updates.\n\n"
-                "Commands:\n"
-                "• /stop - Unsubscribe from updates\n"
-                "• /status - Check your subscription status"
-            )
+            welcome_message = ALREADY_SUBSCRIBED_MESSAGE
         
         await update.message.reply_text(welcome_message, parse_mode=ParseMode.MARKDOWN)
     
@@ -128,20 +258,13 @@ class TelegramBotAgent:
         
         logger.info(f"Unsubscribe request from {username} (chat_id: {chat_id})")
         
-        # Remove subscriber from database
-        success = self.db.remove_telegram_subscriber(chat_id)
-        
+        # Remove subscriber from database (in a worker thread, off the event loop)
+        success = await asyncio.to_thread(self.db.remove_telegram_subscriber, chat_id)
         if success:
-            message = (
-                "👋 *You've been unsubscribed*\n\n"
-                "You won't receive any more news updates.\n\n"
-                "Want to come back? Just send /start anytime!"
-            )
+            self._subscribers_cache = None
+            message = UNSUBSCRIBED_MESSAGE
         else:
-            message = (
-                "🤔 *You weren't subscribed*\n\n"
-                "Want to subscribe? Send /start to get news updates!"
-            )
+            message = NOT_SUBSCRIBED_MESSAGE
         
         await update.message.reply_text(message, parse_mode=ParseMode.MARKDOWN)
     
@@ -149,24 +272,130 @@ class TelegramBotAgent:
         """Handle /status command - Check subscription status."""
         chat_id = update.effective_chat.id
         
-        is_subscribed = self.db.is_telegram_subscriber(chat_id)
+        # Answered from the cached subscriber list, so bursts of /status
+        # cost at most one database read per SUBSCRIBERS_CACHE_TTL
+        _, subscriber_ids = await self._get_subscribers()
+        is_subscribed = chat_id in subscriber_ids
         
         if is_subscribed:
-            message = (
-                "✅ *You're subscribed!*\n\n"
-                "You'll receive news updates as they're published."
-            )
+            message = STATUS_SUBSCRIBED_MESSAGE
         else:
-            message = (
-                "❌ *You're not subscribed*\n\n"
-                "Send /start to subscribe and receive news updates!"
-            )
+            message = STATUS_NOT_SUBSCRIBED_MESSAGE
         
         await update.message.reply_text(message, parse_mode=ParseMode.MARKDOWN)
     
     # ==================== Broadcasting ====================
     
-    async def broadcast_article(self, article: Dict) -> Dict[str, int]:
+    async def _get_subscribers(self) -> Tuple[List[Dict], Set[Any]]:
+        """
+        Return the active subscribers and their chat ids.
+        
+        They are re-read at most every SUBSCRIBERS_CACHE_TTL seconds, and
+        after /start or /stop changes them.
+        """
+        now = time.monotonic()
+        if self._subscribers_cache is None or now - self._subscribers_cache[0] >= SUBSCRIBERS_CACHE_TTL:
+            # Read in a worker thread so sends already in flight keep going
+            rows = await asyncio.to_thread(self.db.get_all_telegram_subscribers,
+                                           {'chat_id': 1, '_id': 0})
+            # One entry per chat, even if it was stored twice (databases
+            # without the unique chat_id index), so nobody gets duplicates
+            by_chat = {row['chat_id']: row for row in rows}
+            self._subscribers_cache = (now, list(by_chat.values()), set(by_chat))
+        return self._subscribers_cache[1], self._subscribers_cache[2]
+    
+    def _get_bot(self) -> Bot:
+        """Return the bot used for broadcasting (created on first use)."""
+        if self.bot is None:
+            self._bot_request = _FastJSONRequest()
+            self.bot = Bot(token=self.bot_token, request=self._bot_request)
+        return self.bot
+    
+    async def _send_one(self, bot: Bot, chat_id, message: str, entities: List[MessageEntity],
+                        image_url: str) -> Optional[Message]:
+        """
+        Send one article message to a chat.
+        
+        Waits for both the bot-wide and the chat's rate limit, and when
+        Telegram's flood control still answers RetryAfter, waits the time
+        it asks for and retries. Network errors and timeouts are retried
+        with exponential backoff.
+        
+        Args:
+            bot: Bot to send with
+            chat_id: Target chat (subscriber chat id or channel username/id)
+            message: Message text (the photo caption if there is an image)
+            entities: Formatting entities for the message text
+            image_url: Image to attach (URL or Telegram file_id), or '' for a text message
+            
+        Returns:
+            The sent message, or None if Telegram rejected it or the request failed
+        """
+        chat_limiter = self._chat_limiters.get(chat_id)
+        if chat_limiter is None:
+            rate = CHANNEL_RATE if chat_id == self.channel_id else CHAT_RATE
+            chat_limiter = self._chat_limiters[chat_id] = AsyncTokenBucket(rate=rate, capacity=1)
+        
+        for attempt in range(SEND_RETRIES + 1):
+            await chat_limiter.acquire()
+            await self._global_limiter.acquire()
+            try:
+                if image_url:
+                    return await bot.send_photo(
+                        chat_id=chat_id,
+                        photo=image_url,
+                        caption=message,
+                        caption_entities=entities
+                    )
+                return await bot.send_message(
+                    chat_id=chat_id,
+                    text=message,
+                    entities=entities,
+                    disable_web_page_preview=False
+                )
+            except RetryAfter as e:
+                if attempt == SEND_RETRIES:
+                    logger.error(f"Failed to send to {chat_id}: {e}")
+                    return None
+                delay = e.retry_after
+                if isinstance(delay, timedelta):
+                    delay = delay.total_seconds()
+                logger.warning(f"Flood control for {chat_id}, retrying in {delay}s")
+                await asyncio.sleep(delay)
+            except BadRequest as e:
+                # A subclass of NetworkError, but resending cannot fix it
+                logger.error(f"Failed to send to {chat_id}: {e}")
+                return None
+            except NetworkError as e:
+                if attempt == SEND_RETRIES:
+                    logger.error(f"Failed to send to {chat_id}: {e}")
+                    return None
+                delay = SEND_BACKOFF * 2 ** attempt
+                logger.warning(f"Network error sending to {chat_id} ({e}), retrying in {delay}s")
+                await asyncio.sleep(delay)
+            except Exception as e:
+                logger.error(f"Failed to send to {chat_id}: {e}")
+                return None
+        return None
+    
+    async def _store_file_id(self, article_id: str, sent_message: Optional[Message]) -> str:
+        """
+        Save the file_id of a sent photo on its article for later broadcasts.
+        
+        Args:
+            article_id: Article the photo belongs to
+            sent_message: Message returned by the send (None if it failed)
+            
+        Returns:
+            The file_id, or '' if the message carried no photo
+        """
+        if sent_message is None or not sent_message.photo:
+            return ''
+        file_id = sent_message.photo[-1].file_id
+        await asyncio.to_thread(self.db.set_telegram_image_file_id, article_id, file_id)
+        return file_id
+    
+    async def broadcast_article(self, article: Dict, mark_broadcast: bool = True) -> Dict[str, int]:
         """
         Broadcast a single article to channel (preferred) or subscribers.
         
@@ -175,6 +404,8 @@ class TelegramBotAgent:
         
         Args:
             article: Article dictionary from database
+            mark_broadcast: Mark the article as broadcast once messages were
+                attempted (callers batching the marks pass False)
             
         Returns:
             Dict with 'sent' and 'failed' counts
@@ -197,7 +428,10 @@ class TelegramBotAgent:
         # Get image URL
         images = article.get('images', {})
         telegram_image = images.get('telegram', {})
-        image_url = telegram_image.get('url', '')
+        # A file_id stored by an earlier broadcast is sent instead of the URL,
+        # so Telegram does not download the image again
+        file_id = telegram_image.get('file_id', '')
+        image_url = file_id or telegram_image.get('url', '')
         
         # Get website content for title
         website_content = platforms.get('website', {})
@@ -206,11 +440,10 @@ class TelegramBotAgent:
         # Build article link
         article_link = f"{self.website_url}/article/{article_id}"
         
-        # Format message
-        message = f"📰 *{title}*\n\n{teaser}\n\n🔗 [Read more]({article_link})"
+        # Format message (once, shared by every send)
+        message, entities = _build_message(title, teaser, article_link)
         
-        # Initialize bot for sending
-        bot = Bot(token=self.bot_token)
+        bot = self._get_bot()
         
         sent = 0
         failed = 0
@@ -218,30 +451,18 @@ class TelegramBotAgent:
         # CHANNEL MODE: Post to channel if configured
         if self.channel_id:
             logger.info(f"Posting article to channel: {self.channel_id}")
-            try:
-                if image_url:
-                    await bot.send_photo(
-                        chat_id=self.channel_id,
-                        photo=image_url,
-                        caption=message,
-                        parse_mode=ParseMode.MARKDOWN
-                    )
-                else:
-                    await bot.send_message(
-                        chat_id=self.channel_id,
-                        text=message,
-                        parse_mode=ParseMode.MARKDOWN,
-                        disable_web_page_preview=False
-                    )
+            sent_message = await self._send_one(bot, self.channel_id, message, entities, image_url)
+            if sent_message is not None:
                 sent = 1
+                if not file_id:
+                    await self._store_file_id(article_id, sent_message)
                 logger.info(f"Successfully posted to channel {self.channel_id}")
-            except Exception as e:
-                logger.error(f"Failed to post to channel {self.channel_id}: {e}")
+            else:
                 failed = 1
         
         # SUBSCRIBER MODE: Fallback to individual subscribers
         else:
-            subscribers = self.db.get_all_telegram_subscribers()
+            subscribers, _ = await self._get_subscribers()
             
             if not subscribers:
                 logger.info("No subscribers to broadcast to")
@@ -249,35 +470,34 @@ class TelegramBotAgent:
             
             logger.info(f"Broadcasting article to {len(subscribers)} subscribers")
             
-            for subscriber in subscribers:
-                chat_id = subscriber.get('chat_id')
-                if not chat_id:
-                    continue
-                
-                try:
-                    if image_url:
-                        await bot.send_photo(
-                            chat_id=chat_id,
-                            photo=image_url,
-                            caption=message,
-                            parse_mode=ParseMode.MARKDOWN
-                        )
-                    else:
-                        await bot.send_message(
-                            chat_id=chat_id,
-                            text=message,
-                            parse_mode=ParseMode.MARKDOWN,
-                            disable_web_page_preview=False
-                        )
-                    sent += 1
+            # Sends overlap, at most MAX_CONCURRENCY at a time
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            
+            async def send_to(chat_id, photo: str) -> Optional[Message]:
+                async with semaphore:
+                    sent_message = await self._send_one(bot, chat_id, message, entities, photo)
+                if sent_message is not None:
                     logger.debug(f"Sent to {chat_id}")
-                    await asyncio.sleep(0.1)  # Rate limit delay
-                except Exception as e:
-                    logger.error(f"Failed to send to {chat_id}: {e}")
-                    failed += 1
+                return sent_message
+            
+            chat_ids = [s['chat_id'] for s in subscribers]
+            results = []
+            photo = image_url
+            if image_url and not file_id and chat_ids:
+                # Send to one subscriber first; the others then get the photo
+                # Telegram already stored (by file_id) instead of Telegram
+                # downloading the image URL again for every subscriber
+                first = await send_to(chat_ids[0], image_url)
+                photo = await self._store_file_id(article_id, first) or image_url
+                results.append(first)
+                chat_ids = chat_ids[1:]
+            results += await asyncio.gather(*(send_to(chat_id, photo) for chat_id in chat_ids))
+            sent = sum(1 for result in results if result is not None)
+            failed = len(results) - sent
         
         # Mark article as broadcasted
-        self.db.mark_article_broadcasted(article_id)
+        if mark_broadcast:
+            await asyncio.to_thread(self.db.mark_article_broadcasted, article_id)
         
         logger.info(f"Broadcast complete: {sent} sent, {failed} failed")
         return {'sent': sent, 'failed': failed}
@@ -300,12 +520,55 @@ class TelegramBotAgent:
                 'enabled': False
             }
         
-        start_time = datetime.utcnow()
+        start_time = time.perf_counter()
+        
+        # Run broadcasting in async context; articles overlap, at most
+        # ARTICLE_CONCURRENCY at a time
+        async def broadcast_all(articles: List[Dict]) -> List[Dict[str, int]]:
+            semaphore = asyncio.Semaphore(ARTICLE_CONCURRENCY)
+            
+            async def broadcast(article: Dict) -> Dict[str, int]:
+                async with semaphore:
+                    return await self.broadcast_article(article, mark_broadcast=False)
+            
+            return await asyncio.gather(*(broadcast(article) for article in articles))
         
-        # Get articles to broadcast (processed but not yet broadcasted)
-        articles = self.db.get_articles_to_broadcast(limit=10)
+        articles_found = 0
+        articles_broadcast = 0
+        total_sent = 0
+        total_failed = 0
         
-        if not articles:
+        # Articles to broadcast (processed but not yet broadcasted) are
+        # queried a batch at a time until none are left. Each batch is a
+        # fresh query rather than one cursor held open across the sends,
+        # which can outlast the server's idle cursor timeout; articles seen
+        # earlier in the run (including skipped, unmarked ones) are excluded
+        seen_ids: Set[Any] = set()
+        while True:
+            articles = self.db.get_articles_to_broadcast(
+                limit=BROADCAST_BATCH_SIZE, projection=BROADCAST_FIELDS, exclude_ids=seen_ids
+            )
+            if not articles:
+                break
+            seen_ids.update(article['_id'] for article in articles)
+            articles_found += len(articles)
+            logger.info(f"Broadcasting batch of {len(articles)} articles")
+            
+            # Run on the shared event loop, which the bot's connection pool is bound to
+            results = run_coroutine(broadcast_all(articles))
+            
+            # Mark every article messages were attempted for in one write per
+            # batch (articles skipped before sending, e.g. without a teaser,
+            # stay unmarked)
+            self.db.mark_articles_broadcasted([
+                str(article['_id']) for article, result in zip(articles, results)
+                if result['sent'] + result['failed'] > 0
+            ])
+            total_sent += sum(result['sent'] for result in results)
+            total_failed += sum(result['failed'] for result in results)
+            articles_broadcast += sum(1 for result in results if result['sent'] > 0)
+        
+        if not articles_found:
             logger.info("No articles to broadcast")
             return {
                 'articles_broadcast': 0,
@@ -314,27 +577,7 @@ class TelegramBotAgent:
                 'enabled': True
             }
         
-        logger.info(f"Found {len(articles)} articles to broadcast")
-        
-        total_sent = 0
-        total_failed = 0
-        articles_broadcast = 0
-        
-        # Run broadcasting in async context
-        async def broadcast_all():
-            nonlocal total_sent, total_failed, articles_broadcast
-            
-            for article in articles:
-                result = await self.broadcast_article(article)
-                total_sent += result['sent']
-                total_failed += result['failed']
-                if result['sent'] > 0:
-                    articles_broadcast += 1
-        
-        # Run the async function
-        asyncio.run(broadcast_all())
-        
-        duration = (datetime.utcnow() - start_time).total_seconds()
+        duration = time.perf_counter() - start_time
         
         summary = {
             'articles_broadcast': articles_broadcast,
@@ -353,7 +596,11 @@ class TelegramBotAgent:
         """
         Start the Telegram bot for handling commands.
         
-        This runs the bot in polling mode to handle /start, /stop, /status commands.
+        Handles /start, /stop, /status commands. With WEBHOOK_URL configured,
+        Telegram pushes updates to a local webhook server on WEBHOOK_PORT
+        (requires python-telegram-bot[webhooks]); otherwise the bot long-polls.
+        Either way only message updates are requested, since commands are
+        all the bot handles.
         """
         if not self.enabled:
             logger.error("Cannot start bot - not configured or disabled")
@@ -362,7 +609,15 @@ class TelegramBotAgent:
         logger.info("Starting Telegram bot...")
         
         # Create application
-        self.application = Application.builder().token(self.bot_token).build()
+        # (getUpdates is never called concurrently, so one connection suffices
+        # for it, as in python-telegram-bot's default builder setup)
+        self.application = (
+            Application.builder()
+            .token(self.bot_token)
+            .request(_FastJSONRequest())
+            .get_updates_request(_FastJSONRequest(connection_pool_size=1))
+            .build()
+        )
         
         # Add command handlers
         self.application.add_handler(CommandHandler("start", self.start_command))
@@ -371,13 +626,34 @@ class TelegramBotAgent:
         
         # Run the bot
         logger.info("Bot is running. Press Ctrl+C to stop.")
-        self.application.run_polling(allowed_updates=Update.ALL_TYPES)
+        if self.webhook_url:
+            # Unguessable path and header secret derived from the token, so
+            # only Telegram can deliver updates
+            token_hash = hashlib.sha256(self.bot_token.encode()).hexdigest()
+            url_path = token_hash[:32]
+            logger.info(f"Webhook mode: listening on port {self.webhook_port}")
+            self.application.run_webhook(
+                listen="0.0.0.0",
+                port=self.webhook_port,
+                url_path=url_path,
+                webhook_url=f"{self.webhook_url.rstrip('/')}/{url_path}",
+                secret_token=token_hash[32:],
+                allowed_updates=[Update.MESSAGE],
+                max_connections=WEBHOOK_MAX_CONNECTIONS
+            )
+        else:
+            self.application.run_polling(allowed_updates=[Update.MESSAGE])
     
     def close(self):
         """Clean up resources."""
-        if self.db:
-            self.db.disconnect()
-            logger.info("Telegram bot agent closed")
+        if self._bot_request:
+            run_coroutine(self._bot_request.shutdown())
+            self._bot_request = None
+            self.bot = None
+        # The MongoDB connection is shared process-wide (see agents._clients)
+        # and is closed at exit
+        self.db = None
+        logger.info("Telegram bot agent closed")
 
 
 # For running as a standalone script (bot mode)
@@ -3,14 +3,63 @@ MongoDB Database Connection Manager
 Handles connection pooling and CRUD operations for articles.
 """
 
+import functools
 import logging
-from datetime import datetime
-from typing import Optional, List, Dict, Any
-from pymongo import MongoClient
-from pymongo.errors import PyMongoError, DuplicateKeyError
+from datetime import datetime, timezone
+from typing import Optional, Iterable, Iterator, List, Dict, Any, Set, Tuple
+from bson import ObjectId
+from pymongo import MongoClient, ReturnDocument, UpdateOne
+from pymongo.write_concern import WriteConcern
+from pymongo.errors import PyMongoError, BulkWriteError, DuplicateKeyError, OperationFailure
 
 logger = logging.getLogger(__name__)
 
+PROMPT_CACHE_TTL_SECONDS = 7 * 24 * 3600
+
+# Connection pool bounds. The agents share one process and issue at most a
+# handful of concurrent operations; one connection is kept open between the
+# orchestrator's runs so a run doesn't start with a TCP/TLS handshake
+MAX_POOL_SIZE = 10
+MIN_POOL_SIZE = 1
+
+# Timeouts in milliseconds. The driver's defaults wait 30s for a server and
+# forever for a reply, so an unreachable or stalled primary would hang a
+# pipeline run instead of failing its stage
+SERVER_SELECTION_TIMEOUT_MS = 5000
+CONNECT_TIMEOUT_MS = 5000
+SOCKET_TIMEOUT_MS = 30000
+WAIT_QUEUE_TIMEOUT_MS = 10000
+
+# Wire compression for traffic to the (typically remote, Atlas) server.
+# zlib ships with Python, unlike the zstd/snappy modules; level 1 trades a
+# little ratio for much less CPU on content-heavy article documents
+COMPRESSORS = "zlib"
+ZLIB_COMPRESSION_LEVEL = 1
+
+# Compound indexes created by connect() and hinted by the queries they serve
+STATUS_INDEX = [("status", 1), ("processed_at", -1)]
+BROADCAST_INDEX = [("status", 1), ("telegram_broadcast", 1), ("processed_at", -1)]
+
+# Subscriber index on chat_id (unique once existing duplicates are gone)
+SUBSCRIBER_INDEX_NAME = "chat_id_1"
+
+# Raw articles are re-scraped if lost, so their inserts are acknowledged by
+# the primary alone rather than waiting for a replica-set majority
+RAW_INSERT_WRITE_CONCERN = WriteConcern(w=1)
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_oid(article_id: str) -> ObjectId:
+    """Parse a hex id string, caching ids seen across pipeline stages."""
+    return ObjectId(article_id)
+
+
+def _oid(article_id: Any) -> ObjectId:
+    """Return article_id as an ObjectId, parsing (cached) if it is a string."""
+    if isinstance(article_id, ObjectId):
+        return article_id
+    return _parse_oid(article_id)
+
 
 class MongoDBManager:
     """Manages MongoDB connections and article operations."""
@@ -34,7 +83,18 @@ class MongoDBManager:
     def connect(self) -> bool:
         """Establish connection to MongoDB."""
         try:
-            self.client = MongoClient(self.connection_url)
+            self.client = MongoClient(
+                self.connection_url,
+                maxPoolSize=MAX_POOL_SIZE,
+                minPoolSize=MIN_POOL_SIZE,
+                serverSelectionTimeoutMS=SERVER_SELECTION_TIMEOUT_MS,
+                connectTimeoutMS=CONNECT_TIMEOUT_MS,
+                socketTimeoutMS=SOCKET_TIMEOUT_MS,
+                waitQueueTimeoutMS=WAIT_QUEUE_TIMEOUT_MS,
+                compressors=COMPRESSORS,
+                zlibCompressionLevel=ZLIB_COMPRESSION_LEVEL,
+                retryWrites=True
+            )
             # Test connection
             self.client.admin.command('ping')
             self.db = self.client[self.database_name]
@@ -42,6 +102,19 @@ class MongoDBManager:
             
             # Create unique index on URL to prevent duplicates
             self.collection.create_index("url", unique=True)
+            # Lookup of already-curated articles with identical content
+            self.collection.create_index("content_hash", sparse=True)
+            # Status queues, newest processed articles first
+            self.collection.create_index(STATUS_INDEX)
+            # Telegram broadcast queue: only not-yet-broadcast articles are
+            # scanned, rather than every processed article ever broadcast
+            self.collection.create_index(BROADCAST_INDEX)
+            # Subscriber lookups by chat (/start, /stop, /status)
+            self._create_subscriber_index()
+            # Cached image prompts expire after a week
+            self._get_prompt_cache_collection().create_index(
+                "created_at", expireAfterSeconds=PROMPT_CACHE_TTL_SECONDS
+            )
             
             logger.info(f"Connected to MongoDB database: {self.database_name}")
             return True
@@ -49,6 +122,29 @@ class MongoDBManager:
             logger.error(f"Failed to connect to MongoDB: {e}")
             return False
     
+    def _create_subscriber_index(self):
+        """
+        Index subscribers by chat_id, uniquely if the existing data allows.
+        
+        The unique index is what makes add_telegram_subscriber's upsert
+        race-free. If it cannot be built (chats already subscribed twice),
+        fall back to a plain index so lookups stay indexed; that plain
+        index is dropped and the unique build retried on the next connect.
+        """
+        subscribers = self._get_subscribers_collection()
+        existing = subscribers.index_information().get(SUBSCRIBER_INDEX_NAME)
+        if existing is not None:
+            if existing.get('unique'):
+                return
+            # A unique index on the same key cannot sit next to the plain one
+            subscribers.drop_index(SUBSCRIBER_INDEX_NAME)
+        try:
+            subscribers.create_index("chat_id", unique=True, name=SUBSCRIBER_INDEX_NAME)
+        except OperationFailure as e:
+            logger.warning(f"Could not create unique chat_id index on subscribers, "
+                           f"remove duplicate chat_ids to enable it: {e}")
+            subscribers.create_index("chat_id", name=SUBSCRIBER_INDEX_NAME)
+    
     def disconnect(self):
         """Close MongoDB connection."""
         if self.client:
@@ -67,7 +163,7 @@ class MongoDBManager:
         """
         try:
             # Add metadata
-            article['createdAt'] = datetime.utcnow()
+            article['createdAt'] = datetime.now(timezone.utc)
             article['status'] = 'raw'  # raw -> processed -> published
             
             self.collection.insert_one(article)
@@ -84,6 +180,9 @@ class MongoDBManager:
         """
         Insert multiple articles, skipping duplicates.
         
+        All articles go to the server in one unordered insert_many, so a
+        duplicate URL (unique index) doesn't stop the rest of the batch.
+        
         Args:
             articles: List of article dictionaries
             
@@ -91,55 +190,163 @@ class MongoDBManager:
             Dictionary with counts: {'inserted': n, 'duplicates': m, 'errors': k}
         """
         results = {'inserted': 0, 'duplicates': 0, 'errors': 0}
+        if not articles:
+            return results
         
+        now = datetime.now(timezone.utc)
         for article in articles:
-            try:
-                article['createdAt'] = datetime.utcnow()
-                article['status'] = 'raw'
-                self.collection.insert_one(article)
-                results['inserted'] += 1
-            except DuplicateKeyError:
-                results['duplicates'] += 1
-            except PyMongoError:
-                results['errors'] += 1
+            article['createdAt'] = now
+            article['status'] = 'raw'
+        
+        try:
+            collection = self.collection.with_options(write_concern=RAW_INSERT_WRITE_CONCERN)
+            inserted = collection.insert_many(articles, ordered=False)
+            results['inserted'] = len(inserted.inserted_ids)
+        except BulkWriteError as bwe:
+            write_errors = bwe.details.get('writeErrors', [])
+            results['inserted'] = bwe.details.get('nInserted', 0)
+            results['duplicates'] = sum(1 for e in write_errors if e.get('code') == 11000)
+            results['errors'] = len(write_errors) - results['duplicates']
+        except PyMongoError as e:
+            logger.error(f"Failed to insert articles: {e}")
+            results['errors'] = len(articles)
         
         logger.info(f"Insert results - New: {results['inserted']}, Duplicates: {results['duplicates']}, Errors: {results['errors']}")
         return results
     
-    def get_raw_articles(self, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get articles with 'raw' status for processing."""
+    def get_raw_articles(self, limit: int = 100,
+                         projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Get articles with 'raw' status for processing.
+        
+        Args:
+            limit: Maximum number of articles
+            projection: Fields to return (default: whole documents)
+        """
+        # The whole result is wanted at once, so fetch it in one batch
+        return list(self.iter_raw_articles(limit=limit, batch_size=limit, projection=projection))
+    
+    def iter_raw_articles(self, limit: int = 100, batch_size: int = 32,
+                          projection: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream articles with 'raw' status from a cursor.
+        
+        Unlike get_raw_articles, the first articles are available as soon as
+        the first batch arrives rather than after the whole result is read.
+        
+        Args:
+            limit: Maximum number of articles to yield
+            batch_size: Documents fetched per round trip
+            projection: Fields to return (default: whole documents)
+            
+        Yields:
+            Raw article documents
+        """
         try:
-            articles = list(self.collection.find({'status': 'raw'}).limit(limit))
-            return articles
+            cursor = self.collection.find({'status': 'raw'}, projection).limit(limit).batch_size(batch_size)
+            with cursor:
+                yield from cursor
         except PyMongoError as e:
             logger.error(f"Failed to fetch raw articles: {e}")
-            return []
     
     def update_article_status(self, article_id: str, new_status: str) -> bool:
         """Update the status of an article."""
         try:
-            from bson import ObjectId
             result = self.collection.update_one(
-                {'_id': ObjectId(article_id)},
-                {'$set': {'status': new_status, 'updatedAt': datetime.utcnow()}}
+                {'_id': _oid(article_id)},
+                {'$set': {'status': new_status}, '$currentDate': {'updatedAt': True}}
             )
             return result.modified_count > 0
         except PyMongoError as e:
             logger.error(f"Failed to update article status: {e}")
             return False
     
+    def bulk_update_status(self, article_ids: List[str], new_status: str) -> int:
+        """
+        Update the status of many articles in a single round trip.
+        
+        Args:
+            article_ids: List of article ID strings
+            new_status: Status to set on every article
+            
+        Returns:
+            Number of articles modified
+        """
+        if not article_ids:
+            return 0
+        
+        try:
+            result = self.collection.bulk_write(
+                [
+                    UpdateOne(
+                        {'_id': _oid(article_id)},
+                        {'$set': {'status': new_status}, '$currentDate': {'updatedAt': True}}
+                    )
+                    for article_id in article_ids
+                ],
+                ordered=False
+            )
+            return result.modified_count
+        except PyMongoError as e:
+            logger.error(f"Failed to bulk update article status: {e}")
+            return 0
+    
     def get_article_count(self) -> Dict[str, int]:
         """Get count of articles by status."""
         try:
             pipeline = [
                 {'$group': {'_id': '$status', 'count': {'$sum': 1}}}
             ]
-            results = list(self.collection.aggregate(pipeline))
+            # Hinting the status index lets the server count from index keys
+            # alone instead of loading every (content-heavy) article
+            results = list(self.collection.aggregate(pipeline, hint=STATUS_INDEX))
             return {r['_id']: r['count'] for r in results}
         except PyMongoError as e:
             logger.error(f"Failed to get article count: {e}")
             return {}
     
+    def get_existing_urls(self, urls: Iterable[str]) -> Set[str]:
+        """
+        Find which of the given article URLs are already stored.
+        
+        A single query answered from the unique url index alone.
+        
+        Args:
+            urls: Article URLs to check
+            
+        Returns:
+            The subset of urls already in the collection
+        """
+        urls = list(urls)
+        if not urls:
+            return set()
+        
+        try:
+            cursor = self.collection.find({'url': {'$in': urls}}, {'_id': 0, 'url': 1})
+            return {doc['url'] for doc in cursor}
+        except PyMongoError as e:
+            logger.error(f"Failed to look up existing URLs: {e}")
+            return set()
+    
+    def find_curated_by_content_hash(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Find an already-curated article with the same content hash.
+        
+        Args:
+            content_hash: SHA-256 hex digest of the normalized article text
+            
+        Returns:
+            Article with its 'curated' and 'platforms' fields, or None
+        """
+        try:
+            return self.collection.find_one(
+                {'content_hash': content_hash, 'curated': {'$exists': True}},
+                {'curated': 1, 'platforms': 1}
+            )
+        except PyMongoError as e:
+            logger.error(f"Failed to look up content hash: {e}")
+            return None
+    
     def update_article_curated_content(self, article_id: str, curated_data: Dict[str, Any]) -> bool:
         """
         Update an article with LLM-generated curated content.
@@ -150,22 +357,21 @@ class MongoDBManager:
                 - curated: {summary, rewritten_content, entities, hashtags}
                 - platforms: {website, telegram, instagram}
                 - processed_at: datetime
+                - content_hash: optional hash of the source text
                 
         Returns:
             True if updated successfully, False otherwise
         """
         try:
-            from bson import ObjectId
             
             update_data = {
                 'status': 'curated',  # curated -> generating_images -> processed
-                'updatedAt': datetime.utcnow(),
                 **curated_data
             }
             
             result = self.collection.update_one(
-                {'_id': ObjectId(article_id)},
-                {'$set': update_data}
+                {'_id': _oid(article_id)},
+                {'$set': update_data, '$currentDate': {'updatedAt': True}}
             )
             
             if result.modified_count > 0:
@@ -179,6 +385,36 @@ class MongoDBManager:
             logger.error(f"Failed to update article with curated content: {e}")
             return False
     
+    def bulk_update_article_curated_content(self, updates: List[Tuple[str, Dict[str, Any]]]) -> int:
+        """
+        Write curated content for many articles in a single round trip.
+        
+        Args:
+            updates: (article_id, curated_data) pairs, curated_data as for
+                update_article_curated_content
+        
+        Returns:
+            Number of articles modified
+        """
+        if not updates:
+            return 0
+        
+        try:
+            result = self.collection.bulk_write(
+                [
+                    UpdateOne(
+                        {'_id': _oid(article_id)},
+                        {'$set': {'status': 'curated', **curated_data}, '$currentDate': {'updatedAt': True}}
+                    )
+                    for article_id, curated_data in updates
+                ],
+                ordered=False
+            )
+            return result.modified_count
+        except PyMongoError as e:
+            logger.error(f"Failed to bulk update articles with curated content: {e}")
+            return 0
+    
     def get_processed_articles(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get articles with 'processed' status ready for publishing."""
         try:
@@ -188,32 +424,79 @@ class MongoDBManager:
             logger.error(f"Failed to fetch processed articles: {e}")
             return []
     
-    def get_articles_for_image_generation(self, limit: int = 100) -> List[Dict[str, Any]]:
+    def get_articles_for_image_generation(self, limit: int = 100,
+                                          projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
         Get articles that are curated but don't have images yet.
         
         Returns articles with status 'curated'.
+        
+        Args:
+            limit: Maximum number of articles
+            projection: Fields to return (default: whole documents)
         """
         try:
             query = {'status': 'curated'}
-            articles = list(self.collection.find(query).limit(limit))
+            articles = list(self.collection.find(query, projection).limit(limit))
             return articles
         except PyMongoError as e:
             logger.error(f"Failed to fetch articles for image generation: {e}")
             return []
     
-    def mark_article_generating_images(self, article_id: str) -> bool:
-        """Mark an article as currently generating images."""
+    def claim_article_for_image_generation(self, article_id: Optional[str] = None,
+                                           projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Atomically take a curated article and mark it as generating images.
+        
+        Finding and marking the article is one operation, so two workers
+        can never claim the same article.
+        
+        Args:
+            article_id: Claim this article (default: the oldest curated one)
+            projection: Fields to return (default: whole documents)
+            
+        Returns:
+            The claimed article, or None if there was none to claim
+        """
+        query: Dict[str, Any] = {'status': 'curated'}
+        if article_id:
+            query['_id'] = _oid(article_id)
         try:
-            from bson import ObjectId
-            result = self.collection.update_one(
-                {'_id': ObjectId(article_id)},
-                {'$set': {'status': 'generating_images', 'updatedAt': datetime.utcnow()}}
+            return self.collection.find_one_and_update(
+                query,
+                {'$set': {'status': 'generating_images'}, '$currentDate': {'updatedAt': True}},
+                projection=projection,
+                sort=[('processed_at', 1)],
+                return_document=ReturnDocument.AFTER
             )
-            return result.modified_count > 0
         except PyMongoError as e:
-            logger.error(f"Failed to mark article as generating: {e}")
-            return False
+            logger.error(f"Failed to claim article for image generation: {e}")
+            return None
+    
+    def release_articles_for_image_generation(self, article_ids: List[str]) -> int:
+        """
+        Return claimed articles that never got their images to 'curated'.
+        
+        Articles already moved past 'generating_images' are left alone.
+        
+        Args:
+            article_ids: MongoDB ObjectId strings of claimed articles
+            
+        Returns:
+            Number of articles released
+        """
+        if not article_ids:
+            return 0
+        try:
+            result = self.collection.update_many(
+                {'_id': {'$in': [_oid(article_id) for article_id in article_ids]},
+                 'status': 'generating_images'},
+                {'$set': {'status': 'curated'}, '$currentDate': {'updatedAt': True}}
+            )
+            return result.modified_count
+        except PyMongoError as e:
+            logger.error(f"Failed to release articles claimed for image generation: {e}")
+            return 0
     
     def update_article_images(self, article_id: str, image_data: Dict[str, Any]) -> bool:
         """
@@ -230,17 +513,15 @@ class MongoDBManager:
             True if updated successfully, False otherwise
         """
         try:
-            from bson import ObjectId
             
             update_data = {
                 'status': 'processed',  # Final status - ready for publishing
-                'updatedAt': datetime.utcnow(),
                 **image_data
             }
             
             result = self.collection.update_one(
-                {'_id': ObjectId(article_id)},
-                {'$set': update_data}
+                {'_id': _oid(article_id)},
+                {'$set': update_data, '$currentDate': {'updatedAt': True}}
             )
             
             if result.modified_count > 0:
@@ -254,19 +535,45 @@ class MongoDBManager:
             logger.error(f"Failed to update article with images: {e}")
             return False
     
-    def get_processed_articles(self, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get articles with 'processed' status ready for publishing."""
+    def bulk_update_article_images(self, updates: List[Tuple[str, Dict[str, Any]]]) -> int:
+        """
+        Write generated image data for many articles in a single round trip.
+        
+        Args:
+            updates: (article_id, image_data) pairs, image_data as for
+                update_article_images
+        
+        Returns:
+            Number of articles modified
+        """
+        if not updates:
+            return 0
+        
         try:
-            articles = list(self.collection.find({'status': 'processed'}).limit(limit))
-            return articles
+            result = self.collection.bulk_write(
+                [
+                    UpdateOne(
+                        {'_id': _oid(article_id)},
+                        {'$set': {'status': 'processed', **image_data}, '$currentDate': {'updatedAt': True}}
+                    )
+                    for article_id, image_data in updates
+                ],
+                ordered=False
+            )
+            return result.modified_count
         except PyMongoError as e:
-            logger.error(f"Failed to fetch processed articles: {e}")
-            return []
+            logger.error(f"Failed to bulk update articles with images: {e}")
+            return 0
     
-    def get_articles_with_incomplete_images(self, limit: int = 100) -> List[Dict[str, Any]]:
+    def get_articles_with_incomplete_images(self, limit: int = 100,
+                                            projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
         Get articles that have incomplete image sets (some images failed to generate)
         AND have not exceeded the maximum retry count (3 retries per platform).
+        
+        Args:
+            limit: Maximum number of articles
+            projection: Fields to return (default: whole documents)
         """
         try:
             MAX_RETRIES = 3
@@ -276,19 +583,23 @@ class MongoDBManager:
             query = {
                 'status': 'processed',
                 'images': {'$exists': True},
-                '$or': [
-                    {'images.website': None},
-                    {'images.telegram': None},
-                    {'images.instagram': {'$size': 0}},
-                    {'images.instagram': {'$elemMatch': {'url': None}}}  # Fixed: was 'path'
-                ],
-                # Only retry if under max retry count
-                '$or': [
-                    {'image_retry_count': {'$exists': False}},
-                    {'image_retry_count': {'$lt': MAX_RETRIES}}
+                # Both conditions must hold; as two '$or' keys of one dict the
+                # second silently replaced the first
+                '$and': [
+                    {'$or': [
+                        {'images.website': None},
+                        {'images.telegram': None},
+                        {'images.instagram': {'$size': 0}},
+                        {'images.instagram': {'$elemMatch': {'url': None}}}  # Fixed: was 'path'
+                    ]},
+                    # Only retry if under max retry count
+                    {'$or': [
+                        {'image_retry_count': {'$exists': False}},
+                        {'image_retry_count': {'$lt': MAX_RETRIES}}
+                    ]}
                 ]
             }
-            articles = list(self.collection.find(query).limit(limit))
+            articles = list(self.collection.find(query, projection).limit(limit))
             return articles
         except PyMongoError as e:
             logger.error(f"Failed to fetch articles with incomplete images: {e}")
@@ -297,14 +608,11 @@ class MongoDBManager:
     def mark_article_for_image_retry(self, article_id: str) -> bool:
         """Mark an article to be retried for image generation and increment retry count."""
         try:
-            from bson import ObjectId
             result = self.collection.update_one(
-                {'_id': ObjectId(article_id)},
+                {'_id': _oid(article_id)},
                 {
-                    '$set': {
-                        'status': 'curated',  # Reset to curated for image retry
-                        'updatedAt': datetime.utcnow()
-                    },
+                    '$set': {'status': 'curated'},  # Reset to curated for image retry
+                    '$currentDate': {'updatedAt': True},
                     '$inc': {'image_retry_count': 1},  # Increment retry count
                     '$unset': {'images': '', 'image_prompts': ''}  # Clear old image data
                 }
@@ -317,9 +625,8 @@ class MongoDBManager:
     def get_article_retry_count(self, article_id: str) -> int:
         """Get the current retry count for an article."""
         try:
-            from bson import ObjectId
             article = self.collection.find_one(
-                {'_id': ObjectId(article_id)},
+                {'_id': _oid(article_id)},
                 {'image_retry_count': 1}
             )
             return article.get('image_retry_count', 0) if article else 0
@@ -327,6 +634,51 @@ class MongoDBManager:
             logger.error(f"Failed to get retry count: {e}")
             return 0
     
+    # ==================== Image Prompt Cache Methods ====================
+    
+    def _get_prompt_cache_collection(self):
+        """Get the image_prompt_cache collection."""
+        return self.db['image_prompt_cache']
+    
+    def get_cached_image_prompts(self, key: str) -> Optional[List[str]]:
+        """
+        Get image prompts previously generated for the same article content.
+        
+        Args:
+            key: Hash of the content the prompts were generated from
+            
+        Returns:
+            Cached prompts, or None on a miss
+        """
+        try:
+            entry = self._get_prompt_cache_collection().find_one({'_id': key}, {'prompts': 1})
+            return entry['prompts'] if entry else None
+        except PyMongoError as e:
+            logger.error(f"Failed to read image prompt cache: {e}")
+            return None
+    
+    def cache_image_prompts(self, key: str, prompts: List[str]) -> bool:
+        """
+        Store generated image prompts for reuse (expires after a week).
+        
+        Args:
+            key: Hash of the content the prompts were generated from
+            prompts: Generated image prompts
+            
+        Returns:
+            True if stored successfully, False otherwise
+        """
+        try:
+            self._get_prompt_cache_collection().update_one(
+                {'_id': key},
+                {'$set': {'prompts': prompts}, '$currentDate': {'created_at': True}},
+                upsert=True
+            )
+            return True
+        except PyMongoError as e:
+            logger.error(f"Failed to write image prompt cache: {e}")
+            return False
+    
     # ==================== Telegram Subscriber Methods ====================
     
     def _get_subscribers_collection(self):
@@ -347,23 +699,30 @@ class MongoDBManager:
         try:
             subscribers = self._get_subscribers_collection()
             
-            # Check if already subscribed
-            existing = subscribers.find_one({'chat_id': chat_id})
-            if existing:
+            # Upsert so the existence check and the insert are one round
+            # trip; the unique chat_id index (see connect) keeps concurrent
+            # /start calls from inserting the chat twice
+            result = subscribers.update_one(
+                {'chat_id': chat_id},
+                {'$setOnInsert': {
+                    'chat_id': chat_id,
+                    'username': username,
+                    'subscribed_at': datetime.now(timezone.utc),
+                    'active': True
+                }},
+                upsert=True
+            )
+            if result.upserted_id is None:
                 logger.debug(f"Subscriber {chat_id} already exists")
                 return False
             
-            # Add new subscriber
-            subscribers.insert_one({
-                'chat_id': chat_id,
-                'username': username,
-                'subscribed_at': datetime.utcnow(),
-                'active': True
-            })
-            
             logger.info(f"Added Telegram subscriber: {username} ({chat_id})")
             return True
             
+        except DuplicateKeyError:
+            # A concurrent /start for the same chat inserted it first
+            logger.debug(f"Subscriber {chat_id} already exists")
+            return False
         except PyMongoError as e:
             logger.error(f"Failed to add subscriber: {e}")
             return False
@@ -395,17 +754,22 @@ class MongoDBManager:
         """Check if a chat_id is subscribed."""
         try:
             subscribers = self._get_subscribers_collection()
-            existing = subscribers.find_one({'chat_id': chat_id, 'active': True})
+            existing = subscribers.find_one({'chat_id': chat_id, 'active': True}, {'_id': 1})
             return existing is not None
         except PyMongoError as e:
             logger.error(f"Failed to check subscriber: {e}")
             return False
     
-    def get_all_telegram_subscribers(self) -> List[Dict[str, Any]]:
-        """Get all active Telegram subscribers."""
+    def get_all_telegram_subscribers(self, projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Get all active Telegram subscribers that have a chat_id.
+        
+        Args:
+            projection: Fields to return (default: whole documents)
+        """
         try:
             subscribers = self._get_subscribers_collection()
-            return list(subscribers.find({'active': True}))
+            return list(subscribers.find({'active': True, 'chat_id': {'$ne': None}}, projection))
         except PyMongoError as e:
             logger.error(f"Failed to fetch subscribers: {e}")
             return []
@@ -421,18 +785,28 @@ class MongoDBManager:
     
     # ==================== Telegram Broadcast Methods ====================
     
-    def get_articles_to_broadcast(self, limit: int = 10) -> List[Dict[str, Any]]:
+    def get_articles_to_broadcast(self, limit: int = 10,
+                                  projection: Optional[Dict[str, Any]] = None,
+                                  exclude_ids: Optional[Iterable[Any]] = None) -> List[Dict[str, Any]]:
         """
         Get processed articles that haven't been broadcast to Telegram yet.
         
         Returns articles with status 'processed' and no telegram_broadcast field.
+        
+        Args:
+            limit: Maximum number of articles
+            projection: Fields to return (default: whole documents)
+            exclude_ids: Article ids to leave out (e.g. already seen this run)
         """
         try:
-            query = {
+            query: Dict[str, Any] = {
                 'status': 'processed',
                 'telegram_broadcast': {'$ne': True}
             }
-            articles = list(self.collection.find(query).sort('processed_at', -1).limit(limit))
+            if exclude_ids:
+                query['_id'] = {'$nin': [_oid(article_id) for article_id in exclude_ids]}
+            cursor = self.collection.find(query, projection).sort('processed_at', -1).hint(BROADCAST_INDEX)
+            articles = list(cursor.limit(limit))
             return articles
         except PyMongoError as e:
             logger.error(f"Failed to fetch articles for broadcast: {e}")
@@ -449,17 +823,56 @@ class MongoDBManager:
             True if marked successfully
         """
         try:
-            from bson import ObjectId
             result = self.collection.update_one(
-                {'_id': ObjectId(article_id)},
-                {'$set': {
-                    'telegram_broadcast': True,
-                    'telegram_broadcast_at': datetime.utcnow()
-                }}
+                {'_id': _oid(article_id)},
+                {'$set': {'telegram_broadcast': True}, '$currentDate': {'telegram_broadcast_at': True}}
             )
             return result.modified_count > 0
         except PyMongoError as e:
             logger.error(f"Failed to mark article as broadcasted: {e}")
             return False
+    
+    def mark_articles_broadcasted(self, article_ids: List[str]) -> int:
+        """
+        Mark several articles as broadcast to Telegram in one update.
+        
+        Args:
+            article_ids: MongoDB ObjectId strings
+            
+        Returns:
+            Number of articles marked
+        """
+        if not article_ids:
+            return 0
+        try:
+            result = self.collection.update_many(
+                {'_id': {'$in': [_oid(article_id) for article_id in article_ids]}},
+                {'$set': {'telegram_broadcast': True}, '$currentDate': {'telegram_broadcast_at': True}}
+            )
+            return result.modified_count
+        except PyMongoError as e:
+            logger.error(f"Failed to mark articles as broadcasted: {e}")
+            return 0
+    
+    def set_telegram_image_file_id(self, article_id: str, file_id: str) -> bool:
+        """
+        Store the file_id Telegram assigned to an article's uploaded image.
+        
+        Args:
+            article_id: MongoDB ObjectId string
+            file_id: Telegram file_id of the photo (valid for this bot only)
+            
+        Returns:
+            True if stored successfully
+        """
+        try:
+            result = self.collection.update_one(
+                {'_id': _oid(article_id)},
+                {'$set': {'images.telegram.file_id': file_id}}
+            )
+            return result.modified_count > 0
+        except PyMongoError as e:
+            logger.error(f"Failed to store Telegram file_id: {e}")
+            return False
 
 
@@ -3,23 +3,41 @@ Main entry point for the Multiagent LLM News system.
 Supports single run and scheduled (continuous) modes.
 """
 
+import atexit
 import logging
+import logging.handlers
 import argparse
-import signal
+import queue
 import sys
 
+# Horizontal rule framing the console summaries
+RULE = "=" * 60
+
 
 def setup_logging(verbose: bool = False):
-    """Configure logging for the application."""
+    """
+    Configure logging for the application.
+    
+    Log calls only format the record and put it on a queue; a listener
+    thread does the console and file writes, so agent threads and the
+    event loop never block on log I/O.
+    """
     level = logging.DEBUG if verbose else logging.INFO
+    log_queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(
+        log_queue,
+        logging.StreamHandler(),
+        logging.FileHandler("pipeline.log", encoding="utf-8"),
+        respect_handler_level=True
+    )
     logging.basicConfig(
         level=level,
         format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.StreamHandler(),
-            logging.FileHandler("pipeline.log", encoding="utf-8")
-        ]
+        handlers=[logging.handlers.QueueHandler(log_queue)]
     )
+    listener.start()
+    # Drain the queue on shutdown
+    atexit.register(listener.stop)
 
 
 def run_once(args):
@@ -33,15 +51,15 @@ def run_once(args):
         agent = ScraperAgent(config_path=args.config)
         result = agent.run(newsapi_count=args.newsapi_count, gnews_count=args.gnews_count)
         
-        print("\n" + "="*60)
+        print("\n" + RULE)
         print("  SCRAPER AGENT RUN COMPLETE")
-        print("="*60)
+        print(RULE)
         print(f"  Total articles fetched:  {result['totalFetched']}")
         print(f"  Unique sources selected: {result['uniqueSelected']}")
         print(f"  New articles stored:     {result['inserted']}")
         print(f"  Duplicates skipped:      {result['duplicates']}")
         print(f"  Errors:                  {result['errors']}")
-        print("="*60)
+        print(RULE)
         
         stats = agent.get_stats()
         if stats:
@@ -62,7 +80,6 @@ def run_once(args):
 def run_scheduler(args):
     """Run the orchestrator in scheduled mode."""
     from agents.orchestrator_agent import OrchestratorAgent, setup_signal_handlers
-    import yaml
     
     logger = logging.getLogger(__name__)
     logger.info("Starting Multiagent LLM News - Scheduled Mode")
@@ -74,16 +91,14 @@ def run_scheduler(args):
         # Get interval from args or config
         interval = args.interval
         if interval is None:
-            with open(args.config, 'r') as f:
-                config = yaml.safe_load(f)
-            interval = config.get('SCHEDULER', {}).get('INTERVAL_MINUTES', 15)
+            interval = orchestrator.config.get('SCHEDULER', {}).get('INTERVAL_MINUTES', 15)
         
-        print("\n" + "="*60)
+        print("\n" + RULE)
         print("  ORCHESTRATOR AGENT - Scheduled Mode")
-        print("="*60)
+        print(RULE)
         print(f"  Interval: {interval} minutes")
         print("  Press Ctrl+C to stop")
-        print("="*60 + "\n")
+        print(RULE + "\n")
         
         orchestrator.start(
             interval_minutes=interval,
@@ -179,20 +194,20 @@ def run_pipeline_once(args):
     try:
         orchestrator = OrchestratorAgent(config_path=args.config)
         
-        print("\n" + "="*60)
+        print("\n" + RULE)
         print("  FULL PIPELINE - Single Run Mode")
-        print("="*60)
+        print(RULE)
         print("  Running: Scraper → Content Curation")
-        print("="*60 + "\n")
+        print(RULE + "\n")
         
         result = orchestrator.run_pipeline()
         
-        print("\n" + "="*60)
+        print("\n" + RULE)
         print("  PIPELINE COMPLETE")
-        print("="*60)
+        print(RULE)
         print(f"  Success: {result['success']}")
         print(f"  Duration: {result['duration_seconds']:.1f}s")
-        print("="*60 + "\n")
+        print(RULE + "\n")
         
         return 0 if result['success'] else 1
         
@@ -0,0 +1,50 @@
+"""
+Configuration loading shared by all agents.
+
+Parsed configs are cached in-process, keyed on the file's path, mtime and
+size, so agents created within one process parse the YAML only once.
+"""
+
+import copy
+import functools
+import os
+from typing import Any, Dict
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _Loader
+
+
+@functools.lru_cache(maxsize=4)
+def _load_config_cached(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """
+    Parse a config file.
+
+    Args:
+        path: Path to the YAML config file
+        mtime_ns: Modification time of the file (part of the cache key)
+        size: Size of the file in bytes (part of the cache key)
+
+    Returns:
+        Parsed configuration dictionary
+    """
+    with open(path, "r") as f:
+        return yaml.load(f, Loader=_Loader) or {}
+
+
+def load_config(config_path: str = "config.yaml") -> Dict[str, Any]:
+    """
+    Load configuration from a YAML file.
+
+    Args:
+        config_path: Path to YAML configuration file
+
+    Returns:
+        Configuration dictionary (a private copy callers may modify)
+    """
+    path = os.path.abspath(config_path)
+    stat = os.stat(path)
+    return copy.deepcopy(_load_config_cached(path, stat.st_mtime_ns, stat.st_size))
@@ -0,0 +1,34 @@
+"""
+JSON encoding/decoding backed by orjson when it is installed.
+
+Falls back to the standard library json module otherwise. Errors keep the
+stdlib types: decoding raises ValueError and encoding raises TypeError.
+"""
+
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # optional accelerator
+    orjson = None
+
+import json
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse a JSON document from str or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> str:
+    """
+    Serialize an object to a compact JSON string.
+
+    Both backends produce the same text for plain strings, lists and dicts,
+    so sort_keys=True output can serve as a stable cache key.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0).decode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, sort_keys=sort_keys)
@@ -2,16 +2,90 @@
 Utility helper functions for the scraper agent.
 """
 
+import asyncio
+import functools
+import io
 import logging
+import re
+import aiohttp
 import requests
-from bs4 import BeautifulSoup
-from datetime import datetime
-from typing import Optional
+from bs4 import BeautifulSoup, SoupStrainer
+from datetime import datetime, timezone
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import List, Optional
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:  # optional accelerator
+    HTMLParser = None
+
+try:
+    from lxml import etree
+except ImportError:  # optional accelerator
+    etree = None
+
+try:
+    from ciso8601 import parse_datetime as _parse_iso8601
+except ImportError:  # optional accelerator
+    _parse_iso8601 = None
 
 logger = logging.getLogger(__name__)
 
+# Characters clean_text drops outright, and the whitespace runs it collapses
+_CLEAN_TRANSLATION = str.maketrans({"\\": None, "\r": None})
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Formats parse_datetime falls back to, and the one each well-formed
+# (zero-padded, millisecond) string length points to
+_DATETIME_FORMATS = [
+    "%Y-%m-%dT%H:%M:%SZ",
+    "%Y-%m-%dT%H:%M:%S.%fZ",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d",
+]
+_DATETIME_FORMAT_BY_LENGTH = {
+    20: "%Y-%m-%dT%H:%M:%SZ",
+    24: "%Y-%m-%dT%H:%M:%S.%fZ",
+    19: "%Y-%m-%d %H:%M:%S",
+    10: "%Y-%m-%d",
+}
+
+# Article pages are read up to this many bytes; paragraphs past the cap
+# are dropped rather than downloading (and parsing) huge pages in full
+MAX_PAGE_BYTES = 2_000_000
+PAGE_CHUNK_SIZE = 64 * 1024
+
+# Hosts the shared requests session keeps a connection pool for (article
+# pages come from many different sites)
+HTTP_POOL_CONNECTIONS = 16
 
-def extract_article_text(url: str, user_agent: str, timeout: int = 10) -> Optional[str]:
+
+@functools.lru_cache(maxsize=1)
+def _get_session() -> requests.Session:
+    """
+    Return the requests session shared by extract_article_text calls.
+    
+    Keeps connections to article hosts alive across calls, so repeat hosts
+    skip the TCP/TLS handshake, and retries transient gateway errors.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _is_html(content_type: str) -> bool:
+    """Whether a Content-Type header may be an HTML page (missing counts as yes)."""
+    return not content_type or "html" in content_type.lower()
+
+
+def extract_article_text(url: str, user_agent: str, timeout: int = 10,
+                         session: Optional[requests.Session] = None) -> Optional[str]:
     """
     Extract article text from a URL by scraping paragraphs.
     
@@ -19,6 +93,7 @@ def extract_article_text(url: str, user_agent: str, timeout: int = 10) -> Option
         url: URL of the article to scrape
         user_agent: User agent string for the request
         timeout: Request timeout in seconds
+        session: Optional requests session (default: the shared module session)
         
     Returns:
         Extracted text or None if failed
@@ -26,36 +101,87 @@ def extract_article_text(url: str, user_agent: str, timeout: int = 10) -> Option
     headers = {"User-Agent": user_agent}
     
     try:
-        response = requests.get(url, headers=headers, timeout=timeout)
-        
-        # Handle forbidden responses
-        if response.status_code == 403:
-            logger.warning(f"Forbidden (403): {url}")
-            return None
-        
-        if response.status_code != 200:
-            logger.warning(f"HTTP {response.status_code}: {url}")
-            return None
-        
-        soup = BeautifulSoup(response.text, "html.parser")
+        with (session or _get_session()).get(url, headers=headers, timeout=timeout, stream=True) as response:
+            # Handle forbidden responses
+            if response.status_code == 403:
+                logger.warning(f"Forbidden (403): {url}")
+                return None
+            
+            if response.status_code != 200:
+                logger.warning(f"HTTP {response.status_code}: {url}")
+                return None
+            
+            if not _is_html(response.headers.get("Content-Type", "")):
+                logger.debug(f"Not an HTML page: {url}")
+                return None
+            
+            body = bytearray()
+            for chunk in response.iter_content(PAGE_CHUNK_SIZE):
+                body += chunk
+                if len(body) >= MAX_PAGE_BYTES:
+                    break
+            html = body[:MAX_PAGE_BYTES].decode(response.encoding or "utf-8", errors="replace")
         
-        # Extract text from paragraphs
-        paragraphs = soup.find_all("p")
-        text = " ".join(p.get_text(strip=True) for p in paragraphs)
+        return parse_article_html(html, url)
         
-        # Clean up text
-        text = clean_text(text)
+    except requests.Timeout:
+        logger.warning(f"Timeout fetching: {url}")
+        return None
+    except requests.RequestException as e:
+        logger.warning(f"Request failed for {url}: {e}")
+        return None
+    except Exception as e:
+        logger.error(f"Unexpected error extracting from {url}: {e}")
+        return None
+
+
+async def fetch_article_text(session: aiohttp.ClientSession, url: str, user_agent: str,
+                             timeout: int = 10) -> Optional[str]:
+    """
+    Async version of extract_article_text using an aiohttp session.
+    
+    HTML parsing runs in a worker thread so other downloads on the event
+    loop keep going meanwhile.
+    
+    Args:
+        session: aiohttp session to issue the request on
+        url: URL of the article to scrape
+        user_agent: User agent string for the request
+        timeout: Request timeout in seconds
         
-        if len(text) < 100:
-            logger.debug(f"Insufficient content extracted from: {url}")
-            return None
+    Returns:
+        Extracted text or None if failed
+    """
+    headers = {"User-Agent": user_agent}
+    
+    try:
+        async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            # Handle forbidden responses
+            if response.status == 403:
+                logger.warning(f"Forbidden (403): {url}")
+                return None
             
-        return text
+            if response.status != 200:
+                logger.warning(f"HTTP {response.status}: {url}")
+                return None
+            
+            if not _is_html(response.headers.get("Content-Type", "")):
+                logger.debug(f"Not an HTML page: {url}")
+                return None
+            
+            body = bytearray()
+            async for chunk in response.content.iter_chunked(PAGE_CHUNK_SIZE):
+                body += chunk
+                if len(body) >= MAX_PAGE_BYTES:
+                    break
+            html = body[:MAX_PAGE_BYTES].decode(response.charset or "utf-8", errors="replace")
         
-    except requests.Timeout:
+        return await asyncio.to_thread(parse_article_html, html, url)
+        
+    except asyncio.TimeoutError:
         logger.warning(f"Timeout fetching: {url}")
         return None
-    except requests.RequestException as e:
+    except aiohttp.ClientError as e:
         logger.warning(f"Request failed for {url}: {e}")
         return None
     except Exception as e:
@@ -63,6 +189,74 @@ def extract_article_text(url: str, user_agent: str, timeout: int = 10) -> Option
         return None
 
 
+def parse_article_html(html: str, url: str = "") -> Optional[str]:
+    """
+    Extract article text from an HTML page by joining its paragraphs.
+    
+    Uses selectolax's C parser when it is installed, then lxml's streaming
+    parser. Otherwise BeautifulSoup builds a tree of just the <p> elements
+    rather than the whole page.
+    
+    Args:
+        html: Page HTML
+        url: URL of the page (for logging)
+        
+    Returns:
+        Extracted text or None if the page has too little content
+    """
+    # Extract text from paragraphs
+    if HTMLParser is not None:
+        paragraphs = HTMLParser(html).css("p")
+        text = " ".join(p.text(separator="", strip=True) for p in paragraphs)
+    elif etree is not None:
+        text = " ".join(_stream_paragraph_texts(html))
+    else:
+        soup = BeautifulSoup(html, "html.parser", parse_only=SoupStrainer("p"))
+        text = " ".join(p.get_text(strip=True) for p in soup.find_all("p"))
+    
+    # Clean up text
+    text = clean_text(text)
+    
+    if len(text) < 100:
+        logger.debug(f"Insufficient content extracted from: {url}")
+        return None
+        
+    return text
+
+
+def _stream_paragraph_texts(html: str) -> List[str]:
+    """
+    Collect the text of each <p> element with lxml's iterparse.
+    
+    Once a paragraph is read it is cleared and the siblings before it in
+    its parent are deleted, so long runs of paragraphs (the bulk of an
+    article page) do not accumulate in the tree. Elements outside those
+    runs stay until parsing ends.
+    
+    Args:
+        html: Page HTML
+        
+    Returns:
+        Text of each paragraph, in document order
+    """
+    texts = []
+    events = etree.iterparse(io.BytesIO(html.encode("utf-8")), events=("end",), tag="p",
+                             html=True, encoding="utf-8")
+    try:
+        for _, paragraph in events:
+            texts.append("".join(part.strip() for part in paragraph.itertext()))
+            paragraph.clear()
+            # Everything before it in the parent has been fully parsed
+            # (any paragraphs there were already read)
+            parent = paragraph.getparent()
+            while paragraph.getprevious() is not None:
+                del parent[0]
+    except etree.LxmlError as e:
+        # Empty or unparseable documents; keep what was read
+        logger.debug(f"lxml stopped parsing: {e}")
+    return texts
+
+
 def clean_text(text: str) -> str:
     """
     Clean and sanitize extracted text.
@@ -73,38 +267,48 @@ def clean_text(text: str) -> str:
     Returns:
         Cleaned text
     """
-    # Remove problematic characters
-    text = text.replace("'", "'")
-    text = text.replace("\\", "")
-    text = text.replace("\xa0", " ")
-    text = text.replace("\n", " ")
-    text = text.replace("\r", "")
-    
-    # Remove multiple spaces
-    while "  " in text:
-        text = text.replace("  ", " ")
-    
-    return text.strip()
+    # Remove problematic characters, then collapse whitespace runs
+    # (including newlines and non-breaking spaces) in a single pass
+    text = text.translate(_CLEAN_TRANSLATION)
+    return _WHITESPACE_RE.sub(" ", text).strip()
 
 
 def parse_datetime(date_string: str) -> Optional[datetime]:
     """
     Parse various datetime formats.
     
+    ISO 8601 strings go through ciso8601's C parser when it is installed;
+    anything it rejects falls back to the strptime formats below.
+    
     Args:
         date_string: Date string to parse
         
     Returns:
-        Parsed datetime or None if failed
+        Parsed datetime (naive, UTC for zoned input) or None if failed
     """
-    formats = [
-        "%Y-%m-%dT%H:%M:%SZ",
-        "%Y-%m-%dT%H:%M:%S.%fZ",
-        "%Y-%m-%d %H:%M:%S",
-        "%Y-%m-%d",
-    ]
-    
-    for fmt in formats:
+    if _parse_iso8601 is not None:
+        try:
+            parsed = _parse_iso8601(date_string)
+        except ValueError:
+            pass
+        else:
+            # Match strptime's naive results for the "...Z" formats
+            if parsed.tzinfo is not None:
+                parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+            return parsed
+    
+    # Try the format matching the string's length first; strptime raises
+    # (slowly) on every mismatch, so the common case now raises none
+    likely_fmt = _DATETIME_FORMAT_BY_LENGTH.get(len(date_string))
+    if likely_fmt is not None:
+        try:
+            return datetime.strptime(date_string, likely_fmt)
+        except ValueError:
+            pass
+    
+    for fmt in _DATETIME_FORMATS:
+        if fmt == likely_fmt:
+            continue
         try:
             return datetime.strptime(date_string, fmt)
         except ValueError:
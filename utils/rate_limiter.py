@@ -0,0 +1,168 @@
+"""
+Token-bucket rate limiters for calls to external APIs.
+
+Callers only wait when a limit is actually about to be exceeded, instead
+of sleeping a fixed delay after every call.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Thread-safe blocking token bucket.
+
+    Tokens refill continuously at `rate` per second up to `capacity`.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize the bucket (full).
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens held (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        """Add the tokens accrued since the last update."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount: float = 1.0):
+        """
+        Block until `amount` tokens are available and take them.
+
+        Args:
+            amount: Tokens to take (clamped to the bucket capacity)
+        """
+        amount = min(amount, self.capacity)
+        with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                time.sleep((amount - self._tokens) / self.rate)
+
+
+class AsyncTokenBucket:
+    """
+    Asyncio token bucket.
+
+    Tokens refill continuously at `rate` per second up to `capacity`.
+    Waiters are served in arrival order.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize the bucket (full).
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens held (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        # Created on first use so the lock belongs to the running loop
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _refill(self):
+        """Add the tokens accrued since the last update."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0):
+        """
+        Wait until `amount` tokens are available and take them.
+
+        Args:
+            amount: Tokens to take (clamped to the bucket capacity)
+        """
+        amount = min(amount, self.capacity)
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                await asyncio.sleep((amount - self._tokens) / self.rate)
+
+    def adjust(self, amount: float):
+        """
+        Take (positive) or return (negative) tokens without waiting.
+
+        The balance may go negative, which makes later acquirers wait
+        until the debt has refilled.
+
+        Args:
+            amount: Tokens to take from the bucket
+        """
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens - amount)
+
+
+class LLMRateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute limiter for LLM calls.
+
+    Token usage is reserved up front from an estimate and corrected with
+    the real usage reported by the API once the call completes.
+    """
+
+    def __init__(self, rpm: Optional[int] = None, tpm: Optional[int] = None):
+        """
+        Initialize the limiter.
+
+        Args:
+            rpm: Requests allowed per minute (None or 0 disables the limit)
+            tpm: Tokens allowed per minute (None or 0 disables the limit)
+        """
+        self.requests = AsyncTokenBucket(rpm / 60.0, rpm) if rpm else None
+        self.tokens = AsyncTokenBucket(tpm / 60.0, tpm) if tpm else None
+
+    async def acquire(self, estimated_tokens: int = 0):
+        """
+        Wait until a request using about `estimated_tokens` may be sent.
+
+        Args:
+            estimated_tokens: Expected prompt + completion tokens
+        """
+        if self.requests:
+            await self.requests.acquire(1)
+        if self.tokens and estimated_tokens:
+            await self.tokens.acquire(estimated_tokens)
+
+    def settle(self, estimated_tokens: int, actual_tokens: Optional[int]):
+        """
+        Correct the token reservation once the real usage is known.
+
+        Args:
+            estimated_tokens: Tokens reserved in acquire()
+            actual_tokens: Tokens the API reported (None keeps the estimate)
+        """
+        if self.tokens and actual_tokens is not None:
+            self.tokens.adjust(actual_tokens - estimated_tokens)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for English text (~4 characters per token)."""
+    return len(text) // 4 + 1
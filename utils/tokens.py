@@ -0,0 +1,55 @@
+"""
+Token counting and truncation for LLM prompts.
+
+Uses tiktoken's cl100k_base encoding when tiktoken is installed. It is not
+the exact tokenizer of the Llama models served by Groq, but it tracks them
+far more closely than character counts. Without tiktoken, falls back to
+~4 characters per token.
+"""
+
+import functools
+from typing import Optional
+
+CHARS_PER_TOKEN = 4
+
+
+@functools.lru_cache(maxsize=1)
+def _encoding() -> Optional[object]:
+    """Return the shared tiktoken encoding, or None if tiktoken is missing."""
+    try:
+        import tiktoken
+    except ImportError:  # optional dependency
+        return None
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text: str) -> int:
+    """Return the (approximate) number of tokens in text."""
+    enc = _encoding()
+    if enc is None:
+        return len(text) // CHARS_PER_TOKEN + 1
+    return len(enc.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Trim text to at most max_tokens tokens.
+
+    Args:
+        text: Text to trim
+        max_tokens: Token budget
+
+    Returns:
+        The text, cut at the token budget if it was longer
+    """
+    enc = _encoding()
+    if enc is None:
+        return text[:max_tokens * CHARS_PER_TOKEN]
+
+    # Text this short cannot exceed the budget (tokens are >= 1 char)
+    if len(text) <= max_tokens:
+        return text
+    tokens = enc.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return enc.decode(tokens[:max_tokens])